@@ -1,10 +1,17 @@
 """
 Extract price data from Sigma_R backtest results for JavaScript validation.
 Reconstructs prices from log returns.
+
+Writes the full-length parity reference (every row, every intermediate
+column) for sigma_r_parity.py, plus a 500-row CSV for the interactive
+browser test page.
 """
 import pandas as pd
 import numpy as np
 
+from sigma_r_framework import _generate_synthetic_spy_data
+from sigma_r_parity import reference_frame, write_parity_file
+
 # Read the full backtest results
 df = pd.read_csv('spy_sigma_r_backtest.csv', index_col=0, parse_dates=True)
 
@@ -28,7 +35,19 @@ output = pd.DataFrame({
     'hurst_python': hurst_python
 })
 
-# Save subset (first 500 rows for browser performance)
+# Full-length reference for the parity harness. vol_imbalance (stage 5)
+# needs the volumes the backtest ran on; they are not in the results CSV,
+# so take them from the seeded synthetic series if that is what it used.
+source = _generate_synthetic_spy_data()
+source_returns = np.log(source['Close'] / source['Close'].shift(1)).fillna(0)
+if source.index.equals(df.index) and np.allclose(source_returns, df['returns'], rtol=0, atol=1e-12):
+    reference = reference_frame(df, source['Close'], source['Volume'])
+else:
+    print("⚠️  Backtest inputs not reproducible here; reference has no volume column")
+    reference = reference_frame(df, prices)
+write_parity_file('spy_sigma_r_reference.srpb', reference)
+
+# Save subset (first 500 rows for the interactive browser test page)
 output_subset = output.head(500)
 output_subset.to_csv('spy_prices_for_js_validation.csv', index=False)
 
@@ -36,3 +55,4 @@ print(f"✅ Extracted {len(output_subset)} price points")
 print(f"📊 Price range: ${prices.min():.2f} - ${prices.max():.2f}")
 print(f"📊 Sigma_R range: {sigma_R_python.min():.4f} - {sigma_R_python.max():.4f}")
 print(f"📁 Saved to: spy_prices_for_js_validation.csv")
+print(f"📁 Full parity reference ({len(df)} rows): spy_sigma_r_reference.srpb")
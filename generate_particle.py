@@ -1,28 +1,233 @@
 #!/usr/bin/env python3
-# Generate 32x32 particle texture with feathered alpha edge
+# Generate particle sprite textures with feathered alpha edges.
+#
+# Builds every sprite variant (size x falloff x feather) with vectorized
+# NumPy, packs them into one mipmapped atlas and writes a JSON UV map:
+#
+#   textures/particle_atlas.png          mip level 0
+#   textures/particle_atlas_mip{k}.png   mip levels 1..n down to 1x1 (premultiplied box filter)
+#   textures/particle_atlas.json         UV map + inputs hash
+#   textures/particle.png                legacy 32x32 quadratic sprite
+#
+# Outputs are reused when the inputs (variant spec and this script) have
+# not changed; pass --force to regenerate.
+#
+# Usage:
+#   python generate_particle.py
+#   python generate_particle.py --sizes 16 32 64 --falloffs gaussian linear --feathers 0 0.3
+
+import argparse
+import hashlib
+import json
+import os
 
-from PIL import Image, ImageDraw
 import numpy as np
+from PIL import Image
+
+# Sprite radius as a fraction of its size (14 px in the original 32 px sprite),
+# which also leaves a transparent margin so atlas cells need no padding
+RADIUS_FRACTION = 14 / 32
+
+FALLOFFS = {
+    'quadratic': lambda t: 1 - t ** 2,
+    'linear': lambda t: 1 - t,
+    'gaussian': lambda t: np.exp(-4.5 * t ** 2),
+    'smoothstep': lambda t: 1 - t * t * (3 - 2 * t),
+}
+
+DEFAULT_SIZES = (8, 16, 32, 64)
+DEFAULT_FALLOFFS = ('quadratic', 'linear', 'gaussian', 'smoothstep')
+DEFAULT_FEATHERS = (0.0, 0.25)
+
+
+def sprite_name(size, falloff, feather):
+    """Atlas key; feathers are resolved to 0.01 (0.25 -> 'f25')."""
+    return f'{falloff}_{size}_f{int(round(feather * 100)):02d}'
+
+
+def render_sprites(size, falloffs, feathers):
+    """
+    Render every (falloff, feather) variant of one size in a single pass.
+
+    Returns a uint8 array of shape (len(falloffs) * len(feathers), size, size, 4).
+    """
+    radius = size * RADIUS_FRACTION
+    coords = np.arange(size) - size / 2 + 0.5
+    dist = np.hypot(coords[None, :], coords[:, None])
+    t = np.clip(dist / radius, 0, 1)
+    inside = dist <= radius
+
+    # (falloffs, 1, size, size) x (1, feathers, size, size)
+    curves = np.stack([FALLOFFS[f](t) for f in falloffs])[:, None]
+    feather = np.asarray(feathers, dtype=np.float64)[None, :, None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        edge = np.where(feather > 0, np.clip((1 - t) / feather, 0, 1), 1.0)
+    edge = edge * edge * (3 - 2 * edge)  # smoothstep into the rim
+
+    alpha = np.where(inside, curves * edge, 0.0)
+    alpha = (255 * alpha).astype(np.uint8).reshape(-1, size, size)
+
+    sprites = np.zeros(alpha.shape + (4,), dtype=np.uint8)
+    sprites[..., :3] = np.where(inside, 255, 0)[None, :, :, None]
+    sprites[..., 3] = alpha
+    return sprites
+
+
+def next_pow2(n):
+    return 1 << max(int(n) - 1, 0).bit_length()
+
+
+def pack_atlas(sprites):
+    """
+    Shelf-pack sprites into power-of-two cells, largest first.
+
+    Cells stay aligned to their own size, so every sprite keeps whole-pixel
+    boundaries down the mip chain until it shrinks to one pixel.
+
+    Returns (atlas RGBA array, {name: (x, y, size)}).
+    """
+    order = sorted(sprites, key=lambda name: -sprites[name].shape[0])
+    cells = [next_pow2(sprites[name].shape[0]) for name in order]
+    width = next_pow2(np.sqrt(sum(c * c for c in cells)))
+    width = max(width, cells[0])
+
+    placements = {}
+    x = y = shelf = 0
+    for name, cell in zip(order, cells):
+        if x + cell > width:
+            x, y, shelf = 0, y + shelf, 0
+        placements[name] = (x, y, sprites[name].shape[0])
+        shelf = max(shelf, cell)
+        x += cell
+    height = next_pow2(y + shelf)
+
+    atlas = np.zeros((height, width, 4), dtype=np.uint8)
+    for name, (x, y, size) in placements.items():
+        atlas[y:y + size, x:x + size] = sprites[name]
+    return atlas, placements
+
+
+def build_mips(atlas):
+    """
+    Complete mip chain below level 0, down to 1x1.
+
+    Each level halves both sides (a side already at 1 px stays 1), box
+    filtering premultiplied colour so transparent texels do not darken
+    the rim, then un-premultiplies for the straight-alpha PNGs.
+    """
+    mips = []
+    level = atlas.astype(np.float32)
+    level[..., :3] *= level[..., 3:] / 255
+    while max(level.shape[:2]) > 1:
+        h, w = max(1, level.shape[0] // 2), max(1, level.shape[1] // 2)
+        fy, fx = level.shape[0] // h, level.shape[1] // w
+        level = level[:h * fy, :w * fx].reshape(h, fy, w, fx, 4).mean(axis=(1, 3))
+
+        out = level.copy()
+        alpha = out[..., 3:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[..., :3] = np.where(alpha > 0, out[..., :3] * 255 / alpha, 0)
+        mips.append(np.clip(np.round(out), 0, 255).astype(np.uint8))
+    return mips
+
+
+def inputs_hash(spec):
+    """Hash of the variant spec and this generator's source."""
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8'))
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def generate(out_dir='textures', sizes=DEFAULT_SIZES, falloffs=DEFAULT_FALLOFFS,
+             feathers=DEFAULT_FEATHERS, force=False):
+    """Build the atlas, its mips, UV map and legacy sprite; returns the UV map."""
+    spec = {
+        'sizes': sorted(set(int(s) for s in sizes)),
+        'falloffs': list(dict.fromkeys(falloffs)),
+        'feathers': list(dict.fromkeys(float(f) for f in feathers)),
+    }
+    for falloff in spec['falloffs']:
+        if falloff not in FALLOFFS:
+            raise ValueError(f"Unknown falloff '{falloff}' (choose from {', '.join(FALLOFFS)})")
+    digest = inputs_hash(spec)
+    uv_path = os.path.join(out_dir, 'particle_atlas.json')
+
+    if not force and os.path.exists(uv_path):
+        with open(uv_path) as f:
+            uv_map = json.load(f)
+        files = [uv_map['atlas']] + uv_map['mips'] + ['particle.png']
+        if uv_map.get('inputs_hash') == digest and all(
+            os.path.exists(os.path.join(out_dir, name)) for name in files
+        ):
+            return uv_map
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    sprites, variants = {}, {}
+    for size in spec['sizes']:
+        batch = render_sprites(size, spec['falloffs'], spec['feathers'])
+        keys = [(size, fo, fe) for fo in spec['falloffs'] for fe in spec['feathers']]
+        for key, sprite in zip(keys, batch):
+            name = sprite_name(*key)
+            if name in sprites:
+                raise ValueError(
+                    f"Feathers {variants[name][2]} and {key[2]} both map to sprite "
+                    f"'{name}'; feathers are resolved to 0.01"
+                )
+            sprites[name] = sprite
+            variants[name] = key
+
+    atlas, placements = pack_atlas(sprites)
+    height, width = atlas.shape[:2]
+
+    Image.fromarray(atlas, 'RGBA').save(os.path.join(out_dir, 'particle_atlas.png'), 'PNG')
+    mip_files = []
+    for k, mip in enumerate(build_mips(atlas), start=1):
+        name = f'particle_atlas_mip{k}.png'
+        Image.fromarray(mip, 'RGBA').save(os.path.join(out_dir, name), 'PNG')
+        mip_files.append(name)
 
-# Create 32x32 RGBA image
-size = 32
-img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    # Legacy single sprite used by the renderer
+    legacy = render_sprites(32, ['quadratic'], [0.0])[0]
+    Image.fromarray(legacy, 'RGBA').save(os.path.join(out_dir, 'particle.png'), 'PNG')
 
-center = size / 2
-max_radius = 14
+    # UVs are measured from the top-left corner (texture.flipY = false)
+    uv_map = {
+        'atlas': 'particle_atlas.png',
+        'mips': mip_files,
+        'width': width,
+        'height': height,
+        'inputs_hash': digest,
+        'spec': spec,
+        'sprites': {
+            name: {
+                'size': size,
+                'falloff': variants[name][1],
+                'feather': variants[name][2],
+                'x': x, 'y': y, 'w': size, 'h': size,
+                'u0': x / width, 'v0': y / height,
+                'u1': (x + size) / width, 'v1': (y + size) / height,
+            }
+            for name, (x, y, size) in sorted(placements.items())
+        },
+    }
+    with open(uv_path, 'w') as f:
+        json.dump(uv_map, f, indent=2)
+    return uv_map
 
-for y in range(size):
-    for x in range(size):
-        dx = x - center + 0.5
-        dy = y - center + 0.5
-        dist = np.sqrt(dx*dx + dy*dy)
 
-        if dist <= max_radius:
-            # Soft falloff from center to edge
-            alpha = int(255 * (1 - (dist / max_radius) ** 2))
-            pixels[y, x] = [255, 255, 255, alpha]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the particle sprite atlas.')
+    parser.add_argument('--out-dir', default='textures')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--falloffs', nargs='+', default=list(DEFAULT_FALLOFFS),
+                        choices=list(FALLOFFS))
+    parser.add_argument('--feathers', type=float, nargs='+', default=list(DEFAULT_FEATHERS))
+    parser.add_argument('--force', action='store_true', help='Regenerate even if up to date')
+    args = parser.parse_args()
 
-img = Image.fromarray(pixels, 'RGBA')
-img.save('textures/particle.png', 'PNG')
-print('✅ Generated textures/particle.png (32×32 px)')
\ No newline at end of file
+    uv_map = generate(args.out_dir, args.sizes, args.falloffs, args.feathers, args.force)
+    print(f"✅ {args.out_dir}/{uv_map['atlas']} ({uv_map['width']}×{uv_map['height']} px, "
+          f"{len(uv_map['sprites'])} sprites, {len(uv_map['mips'])} mip levels)")
+    print(f"✅ {args.out_dir}/particle.png (32×32 px)")
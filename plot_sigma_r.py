@@ -3,19 +3,37 @@ Sigma_R Visualization Script
 =============================
 
 Creates publication-quality plots showing Sigma_R response to market crises.
+
+Every series is downsampled to the pixel width of its panel before drawing
+(LTTB by default, or a min/max envelope), so minute-bar results render as
+fast as daily ones. Figures are built once per worker process and reused as
+templates across symbols, and many symbols' reports render in parallel.
+
+Usage:
+    python plot_sigma_r.py                                  # SPY backtest CSV
+    python plot_sigma_r.py results/*.csv --out-dir reports --jobs 8
+    python plot_sigma_r.py minute_bars.csv --method minmax --dpi 150
+
+With a single input the historical file names are kept
+(sigma_r_backtest_visualization.png, sigma_r_crisis_comparison.png);
+with several inputs each report is prefixed by its symbol (and by its parent
+directory if two inputs share a symbol).
 """
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from datetime import datetime
-
-# Read the backtest results
-df = pd.read_csv('spy_sigma_r_backtest.csv', index_col=0, parse_dates=True)
 
-# Create figure with subplots
-fig, axes = plt.subplots(5, 1, figsize=(14, 12), sharex=True)
-fig.suptitle('Sigma_R Framework - SPY Backtest (2007-2024)', fontsize=16, fontweight='bold')
+from sigma_r_analytics import SigmaRIndex, symbol_label, symbol_labels
+from sigma_r_framework import CRISIS_PERIODS
 
 # Define crisis periods for shading
 crises = [
@@ -23,166 +41,415 @@ crises = [
     ('2020 COVID Crash', '2020-02-19', '2020-04-30', 'orange')
 ]
 
+# Published SPY non-crisis Σ_R mean, drawn as the reference line in the
+# crisis comparison figure
+NORMAL_MEAN = 0.128
+
+# Close-up windows for the crisis comparison figure: (title, window, crisis span, color)
+comparison_windows = [
+    ('2008 Financial Crisis', ('2008-01-01', '2009-12-31'), ('2008-09-15', '2009-03-31'), 'red'),
+    ('2020 COVID Crash', ('2019-01-01', '2021-12-31'), ('2020-02-19', '2020-04-30'), 'orange')
+]
+
+
+# ===================================================================
+# Decimation
+# ===================================================================
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of `n_out` points that preserve the visual shape
+    of (x, y); the first and last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Bucket means used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sums_x / counts, x[-1])
+    mean_y = np.append(sums_y / counts, y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        cx, cy = mean_x[i + 1], mean_y[i + 1]
+        area = np.abs(
+            (x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_envelope(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Indices of the min and max of each of `n_buckets` equal buckets."""
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    padded = np.pad(y, (0, size * n_buckets - n), mode='edge').reshape(n_buckets, size)
+    base = np.arange(n_buckets) * size
+    idx = np.concatenate([base + padded.argmin(axis=1), base + padded.argmax(axis=1)])
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def decimate(x: np.ndarray, y: np.ndarray, n_out: int, method: str = 'lttb') -> np.ndarray:
+    """Indices of at most ~`n_out` points of (x, y) using `method`."""
+    finite = np.isfinite(y)
+    if not finite.all():
+        keep = np.flatnonzero(finite)
+        return keep[decimate(x[keep], y[keep], n_out, method)]
+    if method == 'minmax':
+        return minmax_envelope(y, max(n_out // 2, 1))
+    return lttb(x, y, n_out)
+
+
+# ===================================================================
+# Figure templates
+# ===================================================================
+
 def shade_crises(ax):
     """Add shaded regions for crisis periods."""
     for name, start, end, color in crises:
         ax.axvspan(pd.to_datetime(start), pd.to_datetime(end),
                   alpha=0.15, color=color, label=name)
 
-# ===================================================================
-# Plot 1: Returns and Prices
-# ===================================================================
-ax1 = axes[0]
-ax1_twin = ax1.twinx()
 
-# Plot cumulative returns (price)
-cumulative_returns = (1 + df['returns']).cumprod()
-ax1.plot(df.index, cumulative_returns, label='Cumulative Return', color='black', linewidth=1.5)
-ax1.set_ylabel('Cumulative Return', fontsize=10, fontweight='bold')
-ax1.set_ylim(bottom=0)
-ax1.grid(True, alpha=0.3)
-shade_crises(ax1)
+def _pixel_width(ax, dpi: int) -> int:
+    """Width of an axes in output pixels."""
+    fig = ax.get_figure()
+    return max(int(ax.get_position().width * fig.get_figwidth() * dpi), 3)
 
-# Plot returns
-ax1_twin.fill_between(df.index, 0, df['returns'], alpha=0.3, color='steelblue', label='Daily Returns')
-ax1_twin.set_ylabel('Daily Returns', fontsize=10, color='steelblue')
-ax1_twin.tick_params(axis='y', labelcolor='steelblue')
 
-ax1.set_title('SPY Price and Returns', fontsize=11, fontweight='bold')
-ax1.legend(loc='upper left', fontsize=8)
+def _set_ylim(ax, *arrays, bottom=None, top=None, margin=0.05):
+    """Fit y-limits to data (collections are not covered by autoscale)."""
+    values = np.concatenate([a[np.isfinite(a)] for a in arrays])
+    if len(values) == 0:
+        return
+    lo, hi = values.min(), values.max()
+    pad = (hi - lo) * margin or abs(hi) * margin or 1.0
+    ax.set_ylim(lo - pad if bottom is None else bottom, hi + pad if top is None else top)
 
-# ===================================================================
-# Plot 2: Realized Volatility
-# ===================================================================
-ax2 = axes[1]
-ax2.plot(df.index, df['sigma_short'], label='Short-term Volatility (10d)',
-         color='red', alpha=0.7, linewidth=1)
-ax2.plot(df.index, df['sigma_long'], label='Long-term Volatility (60d)',
-         color='darkred', linewidth=1.5)
-ax2.set_ylabel('Realized Volatility', fontsize=10, fontweight='bold')
-ax2.set_title('Volatility Regimes (Identity & Transformation)', fontsize=11, fontweight='bold')
-ax2.legend(loc='upper right', fontsize=8)
-ax2.grid(True, alpha=0.3)
-shade_crises(ax2)
 
-# ===================================================================
-# Plot 3: Six Forces
-# ===================================================================
-ax3 = axes[2]
-ax3.plot(df.index, df['trans_sm'], label='Transformation (regime shift)',
-         color='purple', linewidth=1, alpha=0.8)
-ax3.plot(df.index, df['hurst'] - 0.5, label='Complexity (H - 0.5, memory)',
-         color='green', linewidth=1, alpha=0.8)
-ax3.plot(df.index, df['ent_sm'], label='Entropy (disorder)',
-         color='orange', linewidth=1, alpha=0.8)
-ax3.plot(df.index, df['res_sm'], label='Resolution (tail risk)',
-         color='red', linewidth=1.5, alpha=0.9)
-ax3.set_ylabel('Force Magnitude', fontsize=10, fontweight='bold')
-ax3.set_title('Six Forces: Transformation, Complexity, Entropy, Resolution', fontsize=11, fontweight='bold')
-ax3.legend(loc='upper right', fontsize=8, ncol=2)
-ax3.grid(True, alpha=0.3)
-ax3.axhline(y=0, color='black', linestyle='--', linewidth=0.5)
-shade_crises(ax3)
+class ReportTemplate:
+    """
+    Reusable 5-panel backtest figure and crisis comparison figure.
 
-# ===================================================================
-# Plot 4: Core Stability (Sigma_C)
-# ===================================================================
-ax4 = axes[3]
-ax4.fill_between(df.index, 0, df['sigma_C'], alpha=0.5, color='steelblue', label='Sigma_C')
-ax4.plot(df.index, df['sigma_C'], color='darkblue', linewidth=1.5)
-ax4.set_ylabel('Core Stability (Σ_C)', fontsize=10, fontweight='bold')
-ax4.set_title('Core Stability (Before Resolution Adjustment)', fontsize=11, fontweight='bold')
-ax4.set_ylim(0, 1)
-ax4.grid(True, alpha=0.3)
-shade_crises(ax4)
-ax4.legend(loc='lower right', fontsize=8)
+    Axes, styling, legends and crisis shading are built once; render()
+    only swaps in decimated line data, fills and annotations per symbol.
 
-# ===================================================================
-# Plot 5: Resolution-Adjusted Stability (Sigma_R)
-# ===================================================================
-ax5 = axes[4]
-ax5.fill_between(df.index, 0, df['sigma_R'], alpha=0.6, color='crimson', label='Sigma_R')
-ax5.plot(df.index, df['sigma_R'], color='darkred', linewidth=2)
-ax5.set_ylabel('Final Stability (Σ_R)', fontsize=10, fontweight='bold')
-ax5.set_xlabel('Date', fontsize=10, fontweight='bold')
-ax5.set_title('Resolution-Adjusted Stability (Final Metric)', fontsize=11, fontweight='bold')
-ax5.set_ylim(0, 0.4)
-ax5.grid(True, alpha=0.3)
-shade_crises(ax5)
-
-# Annotate crisis lows
-crisis_2008 = df.loc['2008-09-01':'2009-03-31']
-crisis_2020 = df.loc['2020-02-01':'2020-04-30']
-
-if len(crisis_2008) > 0:
-    min_2008_date = crisis_2008['sigma_R'].idxmin()
-    min_2008_val = crisis_2008['sigma_R'].min()
-    ax5.annotate(f'2008 Low\n{min_2008_val:.4f}',
-                xy=(min_2008_date, min_2008_val),
-                xytext=(10, 20), textcoords='offset points',
-                bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
-                arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='red'),
-                fontsize=8, fontweight='bold')
+    Parameters
+    ----------
+    dpi : int, default=300
+        Output resolution; also sets the decimation target per panel.
+    method : {'lttb', 'minmax'}, default='lttb'
+        Decimation method.
+    """
+
+    def __init__(self, dpi: int = 300, method: str = 'lttb'):
+        self.dpi = dpi
+        self.method = method
+        self._dynamic = []
+
+        # Create figure with subplots
+        self.fig, axes = plt.subplots(5, 1, figsize=(14, 12), sharex=True)
+        # Placeholder titles so tight_layout() reserves their space
+        self.title = self.fig.suptitle('Sigma_R Framework', fontsize=16, fontweight='bold')
+        self.axes = axes
+        ax1, ax2, ax3, ax4, ax5 = axes
+        self.ax1_twin = ax1.twinx()
+
+        # Plot 1: Returns and Prices
+        self.cum_line, = ax1.plot([], [], label='Cumulative Return', color='black', linewidth=1.5)
+        ax1.set_ylabel('Cumulative Return', fontsize=10, fontweight='bold')
+        ax1.grid(True, alpha=0.3)
+        shade_crises(ax1)
+        self.ax1_twin.set_ylabel('Daily Returns', fontsize=10, color='steelblue')
+        self.ax1_twin.tick_params(axis='y', labelcolor='steelblue')
+        self.ax1_title = ax1.set_title('Price and Returns', fontsize=11, fontweight='bold')
+        ax1.legend(loc='upper left', fontsize=8)
+
+        # Plot 2: Realized Volatility
+        self.vol_lines = {
+            'sigma_short': ax2.plot([], [], label='Short-term Volatility (10d)',
+                                    color='red', alpha=0.7, linewidth=1)[0],
+            'sigma_long': ax2.plot([], [], label='Long-term Volatility (60d)',
+                                   color='darkred', linewidth=1.5)[0],
+        }
+        ax2.set_ylabel('Realized Volatility', fontsize=10, fontweight='bold')
+        ax2.set_title('Volatility Regimes (Identity & Transformation)', fontsize=11, fontweight='bold')
+        ax2.legend(loc='upper right', fontsize=8)
+        ax2.grid(True, alpha=0.3)
+        shade_crises(ax2)
+
+        # Plot 3: Six Forces
+        self.force_lines = {
+            'trans_sm': ax3.plot([], [], label='Transformation (regime shift)',
+                                 color='purple', linewidth=1, alpha=0.8)[0],
+            'hurst': ax3.plot([], [], label='Complexity (H - 0.5, memory)',
+                              color='green', linewidth=1, alpha=0.8)[0],
+            'ent_sm': ax3.plot([], [], label='Entropy (disorder)',
+                               color='orange', linewidth=1, alpha=0.8)[0],
+            'res_sm': ax3.plot([], [], label='Resolution (tail risk)',
+                               color='red', linewidth=1.5, alpha=0.9)[0],
+        }
+        ax3.set_ylabel('Force Magnitude', fontsize=10, fontweight='bold')
+        ax3.set_title('Six Forces: Transformation, Complexity, Entropy, Resolution', fontsize=11, fontweight='bold')
+        ax3.legend(loc='upper right', fontsize=8, ncol=2)
+        ax3.grid(True, alpha=0.3)
+        ax3.axhline(y=0, color='black', linestyle='--', linewidth=0.5)
+        shade_crises(ax3)
 
-if len(crisis_2020) > 0:
-    min_2020_date = crisis_2020['sigma_R'].idxmin()
-    min_2020_val = crisis_2020['sigma_R'].min()
-    ax5.annotate(f'2020 Low\n{min_2020_val:.4f}',
-                xy=(min_2020_date, min_2020_val),
+        # Plot 4: Core Stability (Sigma_C)
+        ax4.fill_between([], [], [], alpha=0.5, color='steelblue', label='Sigma_C')
+        self.sigma_C_line, = ax4.plot([], [], color='darkblue', linewidth=1.5)
+        ax4.set_ylabel('Core Stability (Σ_C)', fontsize=10, fontweight='bold')
+        ax4.set_title('Core Stability (Before Resolution Adjustment)', fontsize=11, fontweight='bold')
+        ax4.set_ylim(0, 1)
+        ax4.grid(True, alpha=0.3)
+        shade_crises(ax4)
+        ax4.legend(loc='lower right', fontsize=8)
+
+        # Plot 5: Resolution-Adjusted Stability (Sigma_R)
+        ax5.fill_between([], [], [], alpha=0.6, color='crimson', label='Sigma_R')
+        self.sigma_R_line, = ax5.plot([], [], color='darkred', linewidth=2)
+        ax5.set_ylabel('Final Stability (Σ_R)', fontsize=10, fontweight='bold')
+        ax5.set_xlabel('Date', fontsize=10, fontweight='bold')
+        ax5.set_title('Resolution-Adjusted Stability (Final Metric)', fontsize=11, fontweight='bold')
+        ax5.set_ylim(0, 0.4)
+        ax5.grid(True, alpha=0.3)
+        shade_crises(ax5)
+        ax5.legend(loc='lower right', fontsize=8)
+
+        # Format x-axis; ticks adapt to the span (years for daily, hours for minute bars)
+        locator = mdates.AutoDateLocator(minticks=5, maxticks=12)
+        ax5.xaxis.set_major_locator(locator)
+        ax5.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.fig.tight_layout()
+
+        # Crisis comparison figure
+        self.fig2, comp_axes = plt.subplots(1, 2, figsize=(14, 5))
+        self.fig2.suptitle('Sigma_R Crisis Response Comparison', fontsize=14, fontweight='bold')
+        self.comparison = []
+        for ax, (title, window, (start, end), color) in zip(comp_axes, comparison_windows):
+            line, = ax.plot([], [], color='darkred', linewidth=2)
+            ax.axvspan(pd.to_datetime(start), pd.to_datetime(end),
+                       alpha=0.2, color=color, label='Crisis Period')
+            ax.set_title(title, fontsize=12, fontweight='bold')
+            ax.set_ylabel('Sigma_R', fontsize=10, fontweight='bold')
+            ax.set_ylim(0, 0.4)
+            ax.set_xlim(pd.to_datetime(window[0]), pd.to_datetime(window[1]))
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=8)
+            ax.axhline(y=NORMAL_MEAN, color='green', linestyle='--', linewidth=1,
+                       label='Normal Mean', alpha=0.7)
+            self.comparison.append((ax, window, line))
+        self.fig2.tight_layout()
+
+        self.width_px = _pixel_width(ax5, dpi)
+        self.comparison_width_px = _pixel_width(comp_axes[0], dpi)
+
+    def _series(self, x: np.ndarray, y: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        idx = decimate(x, y, width, self.method)
+        return x[idx], y[idx]
+
+    def _fill(self, ax, x, y, **kwargs):
+        self._dynamic.append(ax.fill_between(x, 0, y, **kwargs))
+
+    def render(self, df: pd.DataFrame, label: str, report_path: str, comparison_path: str):
+        """Draw one symbol's results into the templates and save both figures."""
+        for artist in self._dynamic:
+            artist.remove()
+        self._dynamic = []
+
+        x = mdates.date2num(df.index)
+        w = self.width_px
+        col = {c: df[c].to_numpy(dtype=np.float64) for c in df.columns}
+        ax1, ax2, ax3, ax4, ax5 = self.axes
+
+        start, end = df.index[0], df.index[-1]
+        self.title.set_text(f'Sigma_R Framework - {label} Backtest ({start.year}-{end.year})')
+        self.ax1_title.set_text(f'{label} Price and Returns')
+
+        # Plot 1: cumulative return line and return fill (min/max keeps every spike)
+        cumulative = np.cumprod(1 + col['returns'])
+        cx, cy = self._series(x, cumulative, w)
+        self.cum_line.set_data(cx, cy)
+        _set_ylim(ax1, cy, bottom=0)
+        ridx = minmax_envelope(col['returns'], w // 2)
+        self._fill(self.ax1_twin, x[ridx], col['returns'][ridx],
+                   alpha=0.3, color='steelblue', label='Daily Returns')
+        _set_ylim(self.ax1_twin, col['returns'][ridx])
+
+        # Plot 2-3: volatility and forces
+        shown = []
+        for name, line in self.vol_lines.items():
+            lx, ly = self._series(x, col[name], w)
+            line.set_data(lx, ly)
+            shown.append(ly)
+        _set_ylim(ax2, *shown)
+
+        shown = []
+        for name, line in self.force_lines.items():
+            y = col[name] - 0.5 if name == 'hurst' else col[name]
+            lx, ly = self._series(x, y, w)
+            line.set_data(lx, ly)
+            shown.append(ly)
+        _set_ylim(ax3, *shown)
+
+        # Plot 4-5: stability fills and lines
+        sx, sy = self._series(x, col['sigma_C'], w)
+        self._fill(ax4, sx, sy, alpha=0.5, color='steelblue')
+        self.sigma_C_line.set_data(sx, sy)
+
+        rx, ry = self._series(x, col['sigma_R'], w)
+        self._fill(ax5, rx, ry, alpha=0.6, color='crimson')
+        self.sigma_R_line.set_data(rx, ry)
+        ax5.set_xlim(x[0], x[-1])
+
+        # Annotate crisis lows
+        index = SigmaRIndex(df['sigma_R'])
+        for name, (crisis_start, crisis_end) in CRISIS_PERIODS.items():
+            min_date, min_val = index.range_min(crisis_start, crisis_end)
+            if min_date is None:
+                continue
+            self._dynamic.append(ax5.annotate(
+                f'{pd.Timestamp(crisis_start).year} Low\n{min_val:.4f}',
+                xy=(mdates.date2num(min_date), min_val),
                 xytext=(10, 20), textcoords='offset points',
                 bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
                 arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='red'),
-                fontsize=8, fontweight='bold')
-
-ax5.legend(loc='lower right', fontsize=8)
-
-# Format x-axis
-ax5.xaxis.set_major_locator(mdates.YearLocator(2))
-ax5.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-ax5.xaxis.set_minor_locator(mdates.YearLocator())
-
-plt.tight_layout()
-plt.savefig('sigma_r_backtest_visualization.png', dpi=300, bbox_inches='tight')
-print("✅ Plot saved to: sigma_r_backtest_visualization.png")
-
-# Also create a focused crisis comparison plot
-fig2, (ax_2008, ax_2020) = plt.subplots(1, 2, figsize=(14, 5))
-fig2.suptitle('Sigma_R Crisis Response Comparison', fontsize=14, fontweight='bold')
-
-# 2008 Crisis
-crisis_window_2008 = df.loc['2008-01-01':'2009-12-31']
-ax_2008.fill_between(crisis_window_2008.index, 0, crisis_window_2008['sigma_R'],
-                     alpha=0.6, color='crimson')
-ax_2008.plot(crisis_window_2008.index, crisis_window_2008['sigma_R'],
-            color='darkred', linewidth=2)
-ax_2008.axvspan(pd.to_datetime('2008-09-15'), pd.to_datetime('2009-03-31'),
-               alpha=0.2, color='red', label='Crisis Period')
-ax_2008.set_title('2008 Financial Crisis', fontsize=12, fontweight='bold')
-ax_2008.set_ylabel('Sigma_R', fontsize=10, fontweight='bold')
-ax_2008.set_ylim(0, 0.4)
-ax_2008.grid(True, alpha=0.3)
-ax_2008.legend(fontsize=8)
-ax_2008.axhline(y=0.128, color='green', linestyle='--', linewidth=1, label='Normal Mean', alpha=0.7)
-
-# 2020 COVID
-crisis_window_2020 = df.loc['2019-01-01':'2021-12-31']
-ax_2020.fill_between(crisis_window_2020.index, 0, crisis_window_2020['sigma_R'],
-                     alpha=0.6, color='crimson')
-ax_2020.plot(crisis_window_2020.index, crisis_window_2020['sigma_R'],
-            color='darkred', linewidth=2)
-ax_2020.axvspan(pd.to_datetime('2020-02-19'), pd.to_datetime('2020-04-30'),
-               alpha=0.2, color='orange', label='Crisis Period')
-ax_2020.set_title('2020 COVID Crash', fontsize=12, fontweight='bold')
-ax_2020.set_ylabel('Sigma_R', fontsize=10, fontweight='bold')
-ax_2020.set_ylim(0, 0.4)
-ax_2020.grid(True, alpha=0.3)
-ax_2020.legend(fontsize=8)
-ax_2020.axhline(y=0.128, color='green', linestyle='--', linewidth=1, label='Normal Mean', alpha=0.7)
-
-plt.tight_layout()
-plt.savefig('sigma_r_crisis_comparison.png', dpi=300, bbox_inches='tight')
-print("✅ Plot saved to: sigma_r_crisis_comparison.png")
-
-print("\n📊 Visualization complete!")
-print("   - sigma_r_backtest_visualization.png (full time series, 5 panels)")
-print("   - sigma_r_crisis_comparison.png (crisis close-ups)")
+                fontsize=8, fontweight='bold'))
+
+        self.fig.savefig(report_path, dpi=self.dpi, bbox_inches='tight')
+
+        # Crisis comparison close-ups
+        for ax, (win_start, win_end), line in self.comparison:
+            window = df.loc[win_start:win_end, 'sigma_R']
+            wx, wy = self._series(mdates.date2num(window.index),
+                                  window.to_numpy(dtype=np.float64), self.comparison_width_px)
+            self._fill(ax, wx, wy, alpha=0.6, color='crimson')
+            line.set_data(wx, wy)
+
+        self.fig2.savefig(comparison_path, dpi=self.dpi, bbox_inches='tight')
+
+
+# ===================================================================
+# Pipeline
+# ===================================================================
+
+_template: Optional[ReportTemplate] = None
+
+
+def _init_worker(dpi: int, method: str):
+    """Build the figure template once per worker process."""
+    global _template
+    _template = ReportTemplate(dpi=dpi, method=method)
+
+
+def _output_prefixes(paths: List[str]) -> List[str]:
+    """
+    Output file prefix per input: the lowercased symbol_labels() label
+    (qualified by the parent directory where two inputs share a symbol).
+
+    Raises ValueError if inputs would still write to the same files.
+    """
+    return [f'{label.lower()}_' for label in symbol_labels(paths)]
+
+
+def _render_one(task) -> Tuple[str, str]:
+    """Worker: load one results CSV and render both figures."""
+    path, report_path, comparison_path = task
+    columns = ['returns', 'sigma_short', 'sigma_long', 'trans_sm', 'hurst',
+               'ent_sm', 'res_sm', 'sigma_C', 'sigma_R']
+    df = pd.read_csv(path, index_col=0, parse_dates=True)[columns]
+    _template.render(df, symbol_label(path), report_path, comparison_path)
+    return report_path, comparison_path
+
+
+def render_reports(
+    paths: List[str],
+    out_dir: Optional[str] = None,
+    dpi: int = 300,
+    method: str = 'lttb',
+    jobs: Optional[int] = None
+) -> List[Tuple[str, str]]:
+    """
+    Render backtest and crisis comparison figures for many results CSVs.
+
+    Parameters
+    ----------
+    paths : list of str
+        Results CSVs written by sigma_r_framework (one per symbol).
+    out_dir : str, optional
+        Output directory (default: current directory).
+    dpi : int, default=300
+        Output resolution.
+    method : {'lttb', 'minmax'}, default='lttb'
+        Decimation method.
+    jobs : int, optional
+        Worker processes (default: all cores, capped at the number of inputs).
+
+    Returns
+    -------
+    list of (report_path, comparison_path)
+    """
+    out_dir = out_dir or '.'
+    os.makedirs(out_dir, exist_ok=True)
+
+    prefixes = [''] if len(paths) == 1 else _output_prefixes(paths)
+    tasks = []
+    for path, prefix in zip(paths, prefixes):
+        tasks.append((
+            path,
+            os.path.join(out_dir, f'{prefix}sigma_r_backtest_visualization.png'),
+            os.path.join(out_dir, f'{prefix}sigma_r_crisis_comparison.png'),
+        ))
+
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        _init_worker(dpi, method)
+        return [_render_one(t) for t in tasks]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(dpi, method)) as pool:
+        return list(pool.map(_render_one, tasks))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Render Sigma_R backtest reports.')
+    parser.add_argument('inputs', nargs='*', default=['spy_sigma_r_backtest.csv'],
+                        help='Results CSVs from sigma_r_framework (default: SPY backtest)')
+    parser.add_argument('--out-dir', default=None, help='Output directory (default: .)')
+    parser.add_argument('--dpi', type=int, default=300, help='Output resolution (default: 300)')
+    parser.add_argument('--method', choices=['lttb', 'minmax'], default='lttb',
+                        help='Decimation method (default: lttb)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+    if len(args.inputs) > 1:
+        try:
+            _output_prefixes(args.inputs)
+        except ValueError as e:
+            parser.error(str(e))
+
+    for report_path, comparison_path in render_reports(
+        args.inputs, args.out_dir, args.dpi, args.method, args.jobs
+    ):
+        print(f"✅ Plot saved to: {report_path}")
+        print(f"✅ Plot saved to: {comparison_path}")
+
+    print("\n📊 Visualization complete!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+"""
+Sigma_R Crisis/Regime Query Layer
+=================================
+
+Precomputed indexes over stored Σ_R backtest results so that episode,
+range-minimum and threshold-crossing questions can be answered across a
+whole universe of symbols without re-slicing and re-scanning DataFrames.
+
+Per symbol (SigmaRIndex):
+    - sparse table of argmins: O(n log n) build, O(1) range-min queries
+    - prefix sums: O(1) range means
+    - rolling-median baseline (default one trading year) and the ratio
+      Σ_R / baseline used for episode detection
+    - running-peak drawdown for drawdown episodes
+
+Across symbols (SigmaRUniverse): the same queries fanned out over every
+index and returned as one tidy DataFrame.
+
+Example:
+    "every episode where Σ_R dropped 50% below its one-year median"
+
+    universe = SigmaRUniverse.from_csv(['spy_sigma_r_backtest.csv'])
+    universe.episodes(drop=0.5)
+
+Author: Sigma_R Framework Team
+Date: 2025-11-05
+"""
+
+import os
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+DateLike = Union[str, pd.Timestamp, None]
+
+
+def symbol_label(path: str) -> str:
+    """'spy_sigma_r_backtest.csv' -> 'SPY'."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for suffix in ('_sigma_r_backtest', '_backtest'):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+    return stem.upper()
+
+
+def symbol_labels(paths: Iterable[str]) -> List[str]:
+    """
+    Unique symbol labels for result files.
+
+    Inputs that share a symbol are qualified by their parent directory
+    (a/spy_sigma_r_backtest.csv -> 'A_SPY'). Raises ValueError if two
+    inputs would still get the same label.
+    """
+    paths = list(paths)
+    labels = [symbol_label(path) for path in paths]
+    out = []
+    for path, label in zip(paths, labels):
+        if labels.count(label) > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            label = f'{parent.upper()}_{label}'
+        out.append(label)
+
+    seen = {}
+    for path, label in zip(paths, out):
+        if label in seen:
+            raise ValueError(
+                f"{seen[label]} and {path} both map to symbol '{label}'; "
+                f"rename one or load them separately"
+            )
+        seen[label] = path
+    return out
+
+
+class SigmaRIndex:
+    """
+    Query index over one symbol's Σ_R series.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Σ_R values with a DatetimeIndex (sorted here if it is not).
+    baseline_window : int, default=252
+        Rolling-median window (bars) for the episode baseline.
+    """
+
+    def __init__(self, series: pd.Series, baseline_window: int = 252):
+        series = series.dropna()
+        if not series.index.is_monotonic_increasing:
+            # Binary searches below assume ascending dates
+            series = series.sort_index(kind='stable')
+        self.name = series.name
+        self.dates = pd.DatetimeIndex(series.index)
+        self.values = series.to_numpy(dtype=np.float64)
+        self._stamps = self.dates.values
+        self.baseline_window = baseline_window
+        n = len(self.values)
+
+        # Sparse table: level k holds the argmin of values[i : i + 2**k]
+        self._table = [np.arange(n)]
+        k = 1
+        while (1 << k) <= n:
+            prev = self._table[-1]
+            half = 1 << (k - 1)
+            left, right = prev[:n - (1 << k) + 1], prev[half:half + n - (1 << k) + 1]
+            self._table.append(np.where(self.values[left] <= self.values[right], left, right))
+            k += 1
+
+        self._prefix = np.concatenate([[0.0], np.cumsum(self.values)])
+
+        self.baseline = series.rolling(baseline_window).median().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.ratio = self.values / self.baseline
+        self.peak = np.maximum.accumulate(self.values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.drawdown = 1 - self.values / self.peak
+
+        self._episode_cache: Dict[tuple, pd.DataFrame] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _bounds(self, start: DateLike, end: DateLike):
+        """Inclusive date range -> half-open position range, like .loc[start:end]."""
+        lo = 0 if start is None else self._position(start, 'left')
+        hi = len(self) if end is None else self._position(end, 'right')
+        return lo, hi
+
+    def _position(self, date: DateLike, side: str) -> int:
+        """Search position of a date; strings resolve like partial-string .loc."""
+        if isinstance(date, str):
+            period = pd.Period(date)
+            date = period.start_time if side == 'left' else period.end_time
+        date = pd.Timestamp(date)
+        if self.dates.tz is not None and date.tz is None:
+            # Wall-clock bounds in the index's zone; _stamps are UTC
+            date = date.tz_localize(self.dates.tz)
+        return int(self._stamps.searchsorted(date.to_datetime64(), side))
+
+    def _argmin(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Vectorized argmin over inclusive position ranges [lo, hi]."""
+        k = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+        out = np.empty(len(lo), dtype=np.int64)
+        for level in np.unique(k):
+            sel = k == level
+            table = self._table[level]
+            left = table[lo[sel]]
+            right = table[hi[sel] - (1 << level) + 1]
+            out[sel] = np.where(self.values[left] <= self.values[right], left, right)
+        return out
+
+    def range_min(self, start: DateLike = None, end: DateLike = None):
+        """
+        Minimum over an inclusive date range.
+
+        Returns
+        -------
+        (pd.Timestamp, float) or (None, nan) if the range is empty.
+            First date of the minimum (matches idxmin) and its value.
+        """
+        lo, hi = self._bounds(start, end)
+        if hi <= lo:
+            return None, np.nan
+        i = self._argmin(np.array([lo]), np.array([hi - 1]))[0]
+        return self.dates[i], self.values[i]
+
+    def summary(self, start: DateLike = None, end: DateLike = None) -> Dict:
+        """Count, min, date of min and mean over an inclusive date range."""
+        lo, hi = self._bounds(start, end)
+        date, value = self.range_min(start, end)
+        return {
+            'count': max(hi - lo, 0),
+            'min': value,
+            'min_date': date,
+            'mean': (self._prefix[hi] - self._prefix[lo]) / (hi - lo) if hi > lo else np.nan
+        }
+
+    def _runs(self, mask: np.ndarray, reference: np.ndarray) -> pd.DataFrame:
+        """Contiguous runs of `mask` with their trough relative to `reference`."""
+        padded = np.concatenate([[False], mask, [False]])
+        edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+        lo, hi = edges[0::2], edges[1::2] - 1
+        trough = self._argmin(lo, hi) if len(lo) else lo
+        return pd.DataFrame({
+            'start': self.dates[lo],
+            'end': self.dates[hi],
+            'length': hi - lo + 1,
+            'trough_date': self.dates[trough],
+            'trough': self.values[trough],
+            'reference': reference[trough],
+            'depth': 1 - self.values[trough] / reference[trough]
+        })
+
+    def episodes(self, drop: float = 0.5, min_length: int = 1) -> pd.DataFrame:
+        """
+        Episodes where Σ_R sits more than `drop` below its rolling-median baseline.
+
+        Parameters
+        ----------
+        drop : float, default=0.5
+            Fractional drop below baseline (0.5 = 50% below).
+        min_length : int, default=1
+            Minimum episode length in bars.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per episode: start, end, length, trough_date, trough,
+            reference (baseline at the trough) and depth (1 - trough / reference).
+        """
+        key = ('baseline', drop)
+        if key not in self._episode_cache:
+            self._episode_cache[key] = self._runs(self.ratio < 1 - drop, self.baseline)
+        episodes = self._episode_cache[key]
+        return episodes[episodes['length'] >= min_length].reset_index(drop=True)
+
+    def drawdowns(self, min_depth: float = 0.5, min_length: int = 1) -> pd.DataFrame:
+        """
+        Episodes where Σ_R sits more than `min_depth` below its running peak.
+
+        Same columns as episodes(), with the running peak as `reference`.
+        """
+        key = ('drawdown', min_depth)
+        if key not in self._episode_cache:
+            self._episode_cache[key] = self._runs(self.drawdown > min_depth, self.peak)
+        episodes = self._episode_cache[key]
+        return episodes[episodes['length'] >= min_length].reset_index(drop=True)
+
+    def crossings(self, threshold: float, direction: str = 'down') -> pd.DatetimeIndex:
+        """
+        Dates where Σ_R crosses `threshold`.
+
+        direction : {'down', 'up', 'both'}
+            'down' marks the first bar below the threshold after a bar at or
+            above it; 'up' the reverse.
+        """
+        assert direction in ('down', 'up', 'both'), "direction must be 'down', 'up' or 'both'"
+        below = self.values < threshold
+        change = np.diff(below.astype(np.int8))
+        if direction == 'down':
+            pos = np.flatnonzero(change == 1)
+        elif direction == 'up':
+            pos = np.flatnonzero(change == -1)
+        else:
+            pos = np.flatnonzero(change)
+        return self.dates[pos + 1]
+
+
+class SigmaRUniverse:
+    """
+    Query layer over many symbols' Σ_R indexes.
+
+    Parameters
+    ----------
+    indexes : dict
+        Symbol -> SigmaRIndex
+    """
+
+    def __init__(self, indexes: Dict[str, SigmaRIndex]):
+        self.indexes = indexes
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Dict[str, Union[pd.DataFrame, pd.Series]],
+        column: str = 'sigma_R',
+        baseline_window: int = 252
+    ) -> 'SigmaRUniverse':
+        """Build from symbol -> compute() output (or Σ_R Series)."""
+        return cls({
+            symbol: SigmaRIndex(
+                df[column] if isinstance(df, pd.DataFrame) else df,
+                baseline_window
+            )
+            for symbol, df in results.items()
+        })
+
+    @classmethod
+    def from_csv(
+        cls,
+        paths: Iterable[str],
+        column: str = 'sigma_R',
+        baseline_window: int = 252
+    ) -> 'SigmaRUniverse':
+        """
+        Build from stored backtest CSVs.
+
+        Symbols come from symbol_labels() ('spy_sigma_r_backtest.csv' ->
+        'SPY'); inputs that would share a symbol raise ValueError.
+        """
+        paths = list(paths)
+        results = {}
+        for path, symbol in zip(paths, symbol_labels(paths)):
+            results[symbol] = pd.read_csv(path, index_col=0, parse_dates=True)[column]
+        return cls.from_results(results, column, baseline_window)
+
+    @property
+    def symbols(self):
+        """Symbols in the universe."""
+        return list(self.indexes)
+
+    def range_min(self, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """Per-symbol minimum (date and value) over an inclusive date range."""
+        rows = {s: idx.range_min(start, end) for s, idx in self.indexes.items()}
+        return pd.DataFrame.from_dict(rows, orient='index', columns=['min_date', 'min'])
+
+    def summary(self, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """Per-symbol count, min, date of min and mean over a date range."""
+        return pd.DataFrame.from_dict(
+            {s: idx.summary(start, end) for s, idx in self.indexes.items()},
+            orient='index'
+        )
+
+    def _concat(self, frames) -> pd.DataFrame:
+        """Stack per-symbol frames with a leading `symbol` column."""
+        frames = [f.assign(symbol=s) for s, f in frames]
+        if not frames:
+            return pd.DataFrame()
+        out = pd.concat(frames, ignore_index=True)
+        return out[['symbol'] + [c for c in out.columns if c != 'symbol']]
+
+    def episodes(self, drop: float = 0.5, min_length: int = 1) -> pd.DataFrame:
+        """All baseline episodes across the universe (see SigmaRIndex.episodes)."""
+        return self._concat(
+            (s, idx.episodes(drop, min_length)) for s, idx in self.indexes.items()
+        )
+
+    def drawdowns(self, min_depth: float = 0.5, min_length: int = 1) -> pd.DataFrame:
+        """All drawdown episodes across the universe (see SigmaRIndex.drawdowns)."""
+        return self._concat(
+            (s, idx.drawdowns(min_depth, min_length)) for s, idx in self.indexes.items()
+        )
+
+    def crossings(self, threshold: float, direction: str = 'down') -> pd.DataFrame:
+        """All threshold crossings across the universe (symbol, date)."""
+        frames = [
+            pd.DataFrame({'symbol': s, 'date': idx.crossings(threshold, direction)})
+            for s, idx in self.indexes.items()
+        ]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,461 @@
+"""
+Sigma_R Live Feed (Memory-Mapped Ring File)
+===========================================
+
+Publishes Σ_R rows and flattened MMPA feature vectors into a fixed-layout,
+memory-mapped ring file so that local readers (the Electron main process,
+the MMPA visual bridge, test harnesses) can poll the latest values at frame
+rate without JSON serialization or sockets.
+
+Binary Layout (little-endian, version 1):
+
+    Offset  Size  Type      Field
+    ------  ----  --------  ------------------------------------------------
+         0     8  char[8]   magic = b"SIGMARF1"
+         8     4  uint32    version (1)
+        12     4  uint32    header_size (bytes, multiple of 8; default 4096)
+        16     4  uint32    n_cols (float64 values per row)
+        20     4  uint32    capacity (rows in the ring)
+        24     8  uint64    seqlock (odd while the writer is mid-update)
+        32     8  uint64    write_seq (total rows ever published)
+        40     4  uint32    row_stride (bytes = n_cols * 8)
+        44     4  uint32    schema_len (bytes of UTF-8 JSON at offset 64)
+        48     8  uint64    epoch (random id of the file instance, never 0)
+        56     8  -         reserved (zero)
+        64     *  utf-8     schema JSON: {"columns": [...], "symbols": [...]}
+    header_size    *  float64   ring data: capacity x n_cols, row-major
+
+Row ``k`` (0-based publish order) lives in slot ``k % capacity``. The most
+recent row is ``write_seq - 1``; rows older than ``write_seq - capacity``
+have been overwritten.
+
+Reader protocol (seqlock):
+    1. s1 = seqlock; if s1 is odd, retry
+    2. n = write_seq; copy the wanted slots
+    3. s2 = seqlock; if s2 != s1, discard the copy and retry
+
+Restarts: a writer reopening a file with the same layout (columns, symbols,
+capacity, header size) reuses it in place and keeps ``epoch`` and
+``write_seq``, so attached readers simply continue. Any other layout is
+written to a fresh file that atomically replaces ``path``; readers still
+mapping the old inode stay valid and switch over on their next poll when
+the file at ``path`` (inode/size) or its ``epoch`` no longer matches their
+mapping. Sequence numbers from a previous epoch are meaningless and are
+treated as 0.
+
+On Windows a file that a reader has open cannot be replaced. There the
+writer falls back to rewriting the header in place under the seqlock: it
+grows the file if needed (never shrinks it, so existing mappings stay
+valid) and sets a new ``epoch``. Readers therefore re-check the epoch
+as well as the file identity, and re-read the header under the seqlock.
+
+In JavaScript the ring can be viewed without copying as
+``new Float64Array(buf.buffer, header_size, capacity * n_cols)``, with
+``seqlock``/``write_seq``/``epoch`` read through
+``DataView.getBigUint64(24/32/48, true)``; re-``fstat`` the path on each
+poll and remap when the inode, size or epoch changes.
+
+Author: Sigma_R Framework Team
+Date: 2025-11-05
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"SIGMARF1"
+VERSION = 1
+DEFAULT_HEADER_SIZE = 4096
+
+_HEADER_FMT = "<8sIIIIQQIIQ"
+_SEQLOCK_OFFSET = 24
+_EPOCH_OFFSET = 48
+_SCHEMA_OFFSET = 64
+
+# Columns produced by SigmaRCalculator.compute(), in pipeline order
+SIGMA_R_COLUMNS = (
+    'returns', 'sigma_short', 'sigma_long', 'trans_raw', 'trans_sm',
+    'hurst_raw', 'hurst', 'ent_raw', 'ent_sm', 'vol_imbalance', 'es',
+    'res_raw', 'res_sm', 'alpha_eff', 'beta_eff', 'D', 'sigma_C', 'sigma_R'
+)
+
+# Flattened keys of SigmaRCalculator.compute_mmpa_features()
+MMPA_FEATURE_KEYS = (
+    'identity.fundamentalFreq', 'identity.strength',
+    'relationship.consonance', 'relationship.complexity',
+    'complexity.brightness', 'complexity.centroid', 'complexity.bandwidth',
+    'transformation.flux', 'transformation.velocity', 'transformation.acceleration',
+    'alignment.coherence', 'alignment.stability', 'alignment.synchrony',
+    'potential.entropy', 'potential.unpredictability', 'potential.freedom',
+    'resolution.sigma_C', 'resolution.sigma_R', 'resolution.res_ratio'
+)
+
+# Every row starts with these bookkeeping columns
+META_COLUMNS = ('timestamp', 'symbol_id')
+
+
+def flatten_mmpa_features(features: Dict) -> np.ndarray:
+    """Flatten a compute_mmpa_features() dict into MMPA_FEATURE_KEYS order."""
+    out = np.empty(len(MMPA_FEATURE_KEYS), dtype=np.float64)
+    for i, key in enumerate(MMPA_FEATURE_KEYS):
+        category, name = key.split('.')
+        out[i] = features[category][name]
+    return out
+
+
+class SigmaRFeedWriter:
+    """
+    Single-writer publisher for the Σ_R ring file.
+
+    Parameters
+    ----------
+    path : str
+        Ring file path. An existing feed with the same layout is reused in
+        place; otherwise a new file atomically replaces it.
+    capacity : int, default=4096
+        Number of row slots in the ring.
+    symbols : sequence of str, optional
+        Symbol names; a row's ``symbol_id`` indexes into this list.
+    columns : sequence of str, optional
+        Σ_R columns to publish (default: all SIGMA_R_COLUMNS).
+    include_mmpa : bool, default=True
+        Append the flattened MMPA feature vector to every row.
+    header_size : int, default=4096
+        Header bytes reserved ahead of the ring data.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 4096,
+        symbols: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        include_mmpa: bool = True,
+        header_size: int = DEFAULT_HEADER_SIZE
+    ):
+        assert capacity > 0, "Ring capacity must be positive"
+        assert header_size % 8 == 0, "Header size must be a multiple of 8"
+
+        self.sigma_columns = list(columns if columns is not None else SIGMA_R_COLUMNS)
+        self.include_mmpa = include_mmpa
+        self.columns = list(META_COLUMNS) + self.sigma_columns
+        if include_mmpa:
+            self.columns += list(MMPA_FEATURE_KEYS)
+        self.symbols = list(symbols) if symbols is not None else []
+        self._symbol_ids = {s: i for i, s in enumerate(self.symbols)}
+
+        schema = json.dumps({
+            'columns': self.columns,
+            'symbols': self.symbols
+        }).encode('utf-8')
+        assert _SCHEMA_OFFSET + len(schema) <= header_size, \
+            "Schema does not fit in header; increase header_size"
+
+        self.path = path
+        self.capacity = capacity
+        self.n_cols = len(self.columns)
+        self.header_size = header_size
+        size = header_size + capacity * self.n_cols * 8
+
+        if not self._reuse(path, size, schema):
+            # Build the new layout beside the old file and swap it in, so
+            # readers still mapping the old inode never see it shrink
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.truncate(size)
+            with open(tmp, 'r+b') as f, mmap.mmap(f.fileno(), size) as mm:
+                epoch = int.from_bytes(os.urandom(8), 'little') or 1
+                struct.pack_into(
+                    _HEADER_FMT, mm, 0,
+                    MAGIC, VERSION, header_size, self.n_cols, capacity,
+                    0, 0, self.n_cols * 8, len(schema), epoch
+                )
+                mm[_SCHEMA_OFFSET:_SCHEMA_OFFSET + len(schema)] = schema
+            try:
+                os.replace(tmp, path)
+            except PermissionError:
+                # Windows: a reader still holds `path` open or mapped
+                os.remove(tmp)
+                self._rewrite_in_place(path, size, schema)
+
+        self._file = open(path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self.epoch = struct.unpack_from('<Q', self._mm, _EPOCH_OFFSET)[0]
+
+        self._seq = np.ndarray((2,), dtype='<u8', buffer=self._mm, offset=_SEQLOCK_OFFSET)
+        self._ring = np.ndarray(
+            (capacity, self.n_cols), dtype='<f8', buffer=self._mm, offset=header_size
+        )
+        if self._seq[0] & 1:
+            self._seq[0] += 1  # previous writer died mid-update
+
+    def _rewrite_in_place(self, path: str, size: int, schema: bytes):
+        """Install the new layout in the existing file under the seqlock."""
+        with open(path, 'r+b') as f:
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)  # grow only; shrinking would break mappings
+            with mmap.mmap(f.fileno(), size) as mm:
+                seqlock = struct.unpack_from('<Q', mm, _SEQLOCK_OFFSET)[0]
+                seqlock = (seqlock | 1) + 2  # next odd value: update in progress
+                struct.pack_into('<Q', mm, _SEQLOCK_OFFSET, seqlock)
+                epoch = int.from_bytes(os.urandom(8), 'little') or 1
+                struct.pack_into(
+                    _HEADER_FMT, mm, 0,
+                    MAGIC, VERSION, self.header_size, self.n_cols, self.capacity,
+                    seqlock, 0, self.n_cols * 8, len(schema), epoch
+                )
+                mm[_SCHEMA_OFFSET:_SCHEMA_OFFSET + len(schema)] = schema
+                struct.pack_into('<Q', mm, _SEQLOCK_OFFSET, seqlock + 1)
+
+    def _reuse(self, path: str, size: int, schema: bytes) -> bool:
+        """True if `path` is a feed file with exactly this layout."""
+        try:
+            if os.path.getsize(path) < size:
+                return False
+            with open(path, 'rb') as f:
+                head = f.read(_SCHEMA_OFFSET + len(schema))
+        except OSError:
+            return False
+        if len(head) < _SCHEMA_OFFSET + len(schema):
+            return False
+        (magic, version, header_size, n_cols, capacity,
+         _, _, _, schema_len, epoch) = struct.unpack_from(_HEADER_FMT, head, 0)
+        return (
+            magic == MAGIC and version == VERSION and epoch != 0
+            and (header_size, n_cols, capacity) == (self.header_size, self.n_cols, self.capacity)
+            and head[_SCHEMA_OFFSET:_SCHEMA_OFFSET + schema_len] == schema
+        )
+
+    @property
+    def write_seq(self) -> int:
+        """Total rows published so far."""
+        return int(self._seq[1])
+
+    def symbol_id(self, symbol: str) -> int:
+        """Return the id of a symbol registered at creation."""
+        if symbol not in self._symbol_ids:
+            raise KeyError(f"Unknown symbol '{symbol}'; pass it in `symbols` at creation")
+        return self._symbol_ids[symbol]
+
+    def publish_rows(self, rows: np.ndarray) -> int:
+        """
+        Publish a block of pre-assembled rows (n x n_cols) under one seqlock.
+
+        Returns
+        -------
+        int
+            The write sequence number after publishing.
+        """
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        assert rows.shape[1] == self.n_cols, \
+            f"Expected {self.n_cols} columns, got {rows.shape[1]}"
+
+        n = len(rows)
+        start = int(self._seq[1])
+        if n > self.capacity:
+            # Only the newest `capacity` rows survive a wrap anyway
+            rows = rows[-self.capacity:]
+        slots = (start + n - len(rows) + np.arange(len(rows))) % self.capacity
+
+        self._seq[0] += 1  # odd: update in progress
+        self._ring[slots] = rows
+        self._seq[1] = start + n
+        self._seq[0] += 1  # even: consistent
+
+        return start + n
+
+    def publish_frame(
+        self,
+        df: pd.DataFrame,
+        calculator=None,
+        symbol: Optional[str] = None,
+        timestamp: Optional[float] = None
+    ) -> int:
+        """
+        Publish the latest row of a compute() result for one symbol.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Output from SigmaRCalculator.compute()
+        calculator : SigmaRCalculator, optional
+            Used for the MMPA feature vector (required if include_mmpa).
+        symbol : str, optional
+            Symbol name registered at creation (id 0 if omitted).
+        timestamp : float, optional
+            Unix seconds; defaults to the wall clock.
+        """
+        row = np.empty(self.n_cols, dtype=np.float64)
+        row[0] = time.time() if timestamp is None else timestamp
+        row[1] = self.symbol_id(symbol) if symbol is not None else 0
+
+        n_sigma = len(self.sigma_columns)
+        row[2:2 + n_sigma] = df[self.sigma_columns].iloc[-1].to_numpy(dtype=np.float64)
+
+        if self.include_mmpa:
+            assert calculator is not None, "calculator is required for MMPA features"
+            row[2 + n_sigma:] = flatten_mmpa_features(calculator.compute_mmpa_features(df))
+
+        return self.publish_rows(row)
+
+    def close(self):
+        """Flush and release the mapping."""
+        if self._mm is not None:
+            self._seq = None
+            self._ring = None
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SigmaRFeedReader:
+    """
+    Polling reader for a Σ_R ring file (any number of readers per file).
+
+    Parameters
+    ----------
+    path : str
+        Ring file written by SigmaRFeedWriter.
+    max_retries : int, default=1000
+        Seqlock retries before giving up on a torn read.
+    """
+
+    def __init__(self, path: str, max_retries: int = 1000):
+        self.path = path
+        self.max_retries = max_retries
+        self._mm = None
+        self._map()
+
+    def _map(self):
+        """(Re)map the file currently at `path` and parse its header."""
+        self.close()
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino, stat.st_size)
+        self._mm = mmap.mmap(self._file.fileno(), stat.st_size, access=mmap.ACCESS_READ)
+
+        for _ in range(self.max_retries):
+            (magic, version, header_size, n_cols, capacity,
+             s1, _, row_stride, schema_len, epoch) = struct.unpack_from(_HEADER_FMT, self._mm, 0)
+            schema = bytes(self._mm[_SCHEMA_OFFSET:_SCHEMA_OFFSET + schema_len])
+            s2 = struct.unpack_from('<Q', self._mm, _SEQLOCK_OFFSET)[0]
+            if not s1 & 1 and s1 == s2:
+                break
+        else:
+            raise RuntimeError("Feed writer held the seqlock for too long")
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a Sigma_R feed file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported feed version {version}")
+        if stat.st_size < header_size + capacity * n_cols * 8:
+            raise ValueError(f"{self.path} is truncated")
+
+        schema = json.loads(schema)
+        self.columns: List[str] = schema['columns']
+        self.symbols: List[str] = schema['symbols']
+        self.capacity = capacity
+        self.n_cols = n_cols
+        self.header_size = header_size
+        self.epoch = epoch
+
+        self._seq = np.ndarray((2,), dtype='<u8', buffer=self._mm, offset=_SEQLOCK_OFFSET)
+        self._ring = np.ndarray(
+            (capacity, n_cols), dtype='<f8', buffer=self._mm, offset=header_size
+        )
+
+    def refresh(self) -> bool:
+        """
+        Remap if the writer restarted with a new file or epoch.
+
+        Called on every poll. Returns True if the reader switched to a new
+        file instance, in which case earlier sequence numbers are void.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False  # mid-swap or writer gone: keep the last mapping
+        epoch = struct.unpack_from('<Q', self._mm, _EPOCH_OFFSET)[0]
+        if (stat.st_dev, stat.st_ino, stat.st_size) == self._identity and epoch == self.epoch:
+            return False
+        self._map()
+        return True
+
+    @property
+    def write_seq(self) -> int:
+        """Total rows published so far (unsynchronized peek)."""
+        return int(self._seq[1])
+
+    def read_since(self, seq: int, max_rows: Optional[int] = None):
+        """
+        Read every row published after sequence number ``seq``.
+
+        Rows that were overwritten before the read are skipped. If the
+        writer restarted with a new file since the last poll, ``seq`` is
+        treated as 0 and every row of the new file is returned.
+
+        Returns
+        -------
+        rows : np.ndarray
+            (n x n_cols) copy of the new rows, oldest first.
+        write_seq : int
+            Sequence number to pass to the next call.
+        """
+        for _ in range(self.max_retries):
+            if self.refresh():
+                seq = 0
+            s1 = int(self._seq[0])
+            if s1 & 1:
+                continue
+            end = int(self._seq[1])
+            start = max(seq, end - self.capacity)
+            if max_rows is not None:
+                start = max(start, end - max_rows)
+            slots = np.arange(start, end) % self.capacity
+            rows = self._ring[slots]  # fancy indexing copies
+            if int(self._seq[0]) == s1:
+                return rows, end
+        raise RuntimeError("Feed writer held the seqlock for too long")
+
+    def latest(self, n: int = 1) -> pd.DataFrame:
+        """Return the ``n`` most recent rows as a DataFrame."""
+        rows, _ = self.read_since(0, max_rows=n)
+        return pd.DataFrame(rows, columns=self.columns)
+
+    def latest_by_symbol(self) -> pd.DataFrame:
+        """Return the most recent row per symbol still present in the ring."""
+        df = self.latest(self.capacity)
+        df = df.drop_duplicates('symbol_id', keep='last').sort_values('symbol_id')
+        if self.symbols:
+            ids = df['symbol_id'].astype(int)
+            df.index = [self.symbols[i] if i < len(self.symbols) else i for i in ids]
+        return df
+
+    def close(self):
+        """Release the mapping."""
+        if self._mm is not None:
+            self._seq = None
+            self._ring = None
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
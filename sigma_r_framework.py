@@ -28,11 +28,24 @@ Six Forces (MMPA Mapping):
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 import warnings
 
 warnings.filterwarnings('ignore')
 
+# Crisis windows shared by the backtest report, regime-aware simulation
+# and event analysis (start, end inclusive)
+CRISIS_PERIODS = {
+    '2008 Crisis': ('2008-09-01', '2009-03-31'),
+    '2020 COVID': ('2020-02-01', '2020-04-30'),
+}
+
+# Default realized-volatility term structure (bars)
+TERM_STRUCTURE_WINDOWS = (5, 10, 20, 60, 120, 252)
+
+# Rows per restart of the rolling-volatility cumulative sums
+ROLLING_BLOCK_ROWS = 4096
+
 
 class SigmaRCalculator:
     """
@@ -141,6 +154,148 @@ class SigmaRCalculator:
         clipped = np.clip(x, 0, max_val)
         return np.log1p(clipped)
 
+    def _rolling_std_multi(self, returns: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+        """
+        Rolling sample std (ddof=1) along the last axis for several windows.
+
+        All windows share one cumulative sum of returns and one of squared
+        returns, so each extra window costs two subtractions instead of a
+        full rolling pass. The sums restart every ROLLING_BLOCK_ROWS rows
+        (each block re-reads the largest window's lookback), so rounding
+        grows with the block length rather than the series length, and
+        windows far quieter than their block are recomputed directly. Returns shape (len(windows),) +
+        returns.shape, NaN during each window's warm-up and for every window
+        containing a non-finite return (like rolling().std(), e.g. the
+        leading NaN of np.log(close).diff()).
+        """
+        r = np.asarray(returns, dtype=np.float64)
+        n = r.shape[-1]
+        windows = list(windows)
+        assert all(w >= 2 for w in windows), "Volatility windows must be at least 2 bars"
+        finite = np.isfinite(r)
+        r = np.where(finite, r, 0.0)
+
+        out = np.full((len(windows),) + r.shape, np.nan)
+        w_max = min(max(windows), n)
+        block = max(ROLLING_BLOCK_ROWS, w_max)
+        for b0 in range(0, n, block):
+            b1 = min(b0 + block, n)
+            a = max(b0 - w_max + 1, 0)
+            seg, seg_finite = r[..., a:b1], finite[..., a:b1]
+
+            # Missing returns are zeroed for the sums and counted separately;
+            # variance is shift-invariant, so removing the block mean keeps
+            # the sums small
+            count = np.maximum(seg_finite.sum(axis=-1, keepdims=True), 1)
+            x = np.where(seg_finite, seg - seg.sum(axis=-1, keepdims=True) / count, 0.0)
+            zeros = np.zeros(x.shape[:-1] + (1,))
+            s1 = np.concatenate([zeros, np.cumsum(x, axis=-1)], axis=-1)
+            s2 = np.concatenate([zeros, np.cumsum(x * x, axis=-1)], axis=-1)
+            gaps = np.concatenate([zeros, np.cumsum(~seg_finite, axis=-1)], axis=-1)
+
+            for k, w in enumerate(windows):
+                j0 = max(b0, w - 1)  # first output row of this block
+                if j0 >= b1:
+                    continue
+                hi = slice(j0 + 1 - a, b1 + 1 - a)
+                lo = slice(j0 + 1 - a - w, b1 + 1 - a - w)
+                sum1 = s1[..., hi] - s1[..., lo]
+                ss = (s2[..., hi] - s2[..., lo]) - sum1 * sum1 / w
+                # Differencing loses about log2(s2 / ss) bits of this
+                # window's variance; recompute windows that lose over 20
+                has_gap = gaps[..., hi] > gaps[..., lo]
+                redo = np.nonzero((ss <= 2.0 ** -20 * s2[..., hi]) & ~has_gap)
+                if len(redo[-1]):
+                    ss[redo] = self._window_sum_squares(r, redo[:-1], redo[-1] + j0, w)
+                std = np.sqrt(np.maximum(ss, 0.0) / (w - 1))
+                out[k, ..., j0:b1] = np.where(has_gap, np.nan, std)
+        return out
+
+    @staticmethod
+    def _window_sum_squares(
+        r: np.ndarray,
+        lead: Tuple[np.ndarray, ...],
+        ends: np.ndarray,
+        w: int
+    ) -> np.ndarray:
+        """Two-pass sum of squared deviations of r[lead..., end-w+1:end+1]."""
+        out = np.empty(len(ends))
+        step = max(1, (1 << 20) // w)
+        offsets = np.arange(1 - w, 1)
+        for i in range(0, len(ends), step):
+            cols = ends[i:i + step, None] + offsets
+            vals = r[tuple(idx[i:i + step, None] for idx in lead) + (cols,)]
+            dev = vals - vals.mean(axis=1, keepdims=True)
+            out[i:i + step] = np.einsum('ij,ij->i', dev, dev)
+        return out
+
+    def realized_volatility(
+        self,
+        returns: pd.Series,
+        windows: Sequence[int] = TERM_STRUCTURE_WINDOWS
+    ) -> pd.DataFrame:
+        """
+        Realized volatility term structure in a single pass.
+
+        Parameters
+        ----------
+        returns : pd.Series
+            Log returns (e.g., the 'returns' column of compute())
+        windows : sequence of int
+            Rolling windows in bars (each >= 2)
+
+        Returns
+        -------
+        pd.DataFrame
+            (time x windows) rolling std, one column per window,
+            NaN during each window's warm-up and wherever the window
+            contains a missing (NaN/inf) return, as with rolling().std()
+        """
+        windows = list(windows)
+        vol = self._rolling_std_multi(returns.to_numpy(dtype=np.float64), windows)
+        return pd.DataFrame(vol.T, index=returns.index, columns=windows)
+
+    def transformation_surface(
+        self,
+        vol: pd.DataFrame,
+        smoothed: bool = False
+    ) -> pd.DataFrame:
+        """
+        Transformation ratio between every pair of volatility windows.
+
+        Parameters
+        ----------
+        vol : pd.DataFrame
+            Output from realized_volatility()
+        smoothed : bool, default=False
+            If True, apply the compute() Transformation treatment
+            (|ratio| clipped at 10, log1p-compressed, EWMA over trans_span)
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns are a (short, long) MultiIndex for every window pair with
+            short < long; values are (σ_short - σ_long) / σ_long, with
+            warm-up NaNs treated as 0 and σ_long floored at epsilon, exactly
+            as in compute()
+        """
+        p = self.params
+        windows = sorted(vol.columns)
+        V = np.nan_to_num(vol[windows].to_numpy(dtype=np.float64))
+        short, long_ = np.triu_indices(len(windows), k=1)
+
+        sigma_long = np.maximum(V[:, long_], p['epsilon'])
+        surface = (V[:, short] - sigma_long) / sigma_long
+
+        columns = pd.MultiIndex.from_arrays(
+            [[windows[i] for i in short], [windows[j] for j in long_]],
+            names=['short', 'long']
+        )
+        out = pd.DataFrame(surface, index=vol.index, columns=columns)
+        if smoothed:
+            out = self._ewma(np.log1p(out.abs().clip(upper=10.0)), p['trans_span'])
+        return out
+
     def _estimate_hurst(self, returns: pd.Series, window: int) -> float:
         """
         Estimate Hurst exponent using R/S analysis.
@@ -254,8 +409,12 @@ class SigmaRCalculator:
         # =====================================================================
         # 1. Realized Volatility (short and long windows)
         # =====================================================================
-        df['sigma_short'] = returns.rolling(p['short_vol_window']).std().fillna(0)
-        df['sigma_long'] = returns.rolling(p['long_vol_window']).std().fillna(0)
+        sigma_short, sigma_long = self._rolling_std_multi(
+            returns.to_numpy(dtype=np.float64),
+            [p['short_vol_window'], p['long_vol_window']]
+        )
+        df['sigma_short'] = np.nan_to_num(sigma_short)
+        df['sigma_long'] = np.nan_to_num(sigma_long)
 
         # Floor long vol to prevent division by zero
         df['sigma_long'] = df['sigma_long'].clip(lower=eps)
@@ -373,6 +532,217 @@ class SigmaRCalculator:
 
         return df
 
+    def _ewma_rows(self, x: np.ndarray, span: int) -> np.ndarray:
+        """Row-wise EWMA of a (paths x time) array, matching _ewma()."""
+        return pd.DataFrame(x.T).ewm(span=span, adjust=False).mean().to_numpy().T
+
+    def _rolling_mean_rows(self, x: np.ndarray, window: int) -> np.ndarray:
+        """Row-wise rolling mean of a (paths x time) array (NaN warm-up)."""
+        return pd.DataFrame(x.T).rolling(window).mean().to_numpy().T
+
+    def _window_chunks(self, n_paths: int, n: int, first: int, window: int, chunk_bytes: int):
+        """Time ranges [t0, t1) from `first` whose (paths x chunk x window) fits the budget."""
+        step = max(1, chunk_bytes // (8 * n_paths * window))
+        for t0 in range(first, n, step):
+            yield t0, min(n, t0 + step)
+
+    def compute_batch(
+        self,
+        returns: np.ndarray,
+        volumes: Optional[np.ndarray] = None,
+        chunk_bytes: int = 64 * 2**20
+    ) -> np.ndarray:
+        """
+        Compute Sigma_R for many return paths in one vectorized pass.
+
+        Equivalent to calling compute() once per path, but the rolling Hurst,
+        autocorrelation and Expected Shortfall loops are evaluated as
+        (paths x time x window) array operations. Those are taken in time
+        chunks of about `chunk_bytes` each, so working memory is a few
+        (paths x time) arrays plus a few chunk-sized window temporaries.
+
+        Parameters
+        ----------
+        returns : np.ndarray
+            Log returns, shape (paths, time). compute() sets the first return
+            to 0; do the same here to reproduce it exactly.
+        volumes : np.ndarray, optional
+            Volumes aligned with `returns`, shape (paths, time).
+        chunk_bytes : int, default=64 MiB
+            Approximate size of each (paths x chunk x window) float64 block.
+
+        Returns
+        -------
+        np.ndarray
+            Sigma_R, shape (paths, time).
+        """
+        p = self.params
+        eps = p['epsilon']
+        r = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+        n_paths, n = r.shape
+        sliding = np.lib.stride_tricks.sliding_window_view
+
+        # 1-2. Realized volatility and Transformation
+        sigma_short, sigma_long = np.nan_to_num(
+            self._rolling_std_multi(r, [p['short_vol_window'], p['long_vol_window']])
+        )
+        sigma_long = np.maximum(sigma_long, eps)
+        trans_raw = (sigma_short - sigma_long) / sigma_long
+        trans_sm = self._ewma_rows(np.log1p(np.minimum(np.abs(trans_raw), 10.0)), p['trans_span'])
+
+        # 3. Complexity - R/S Hurst over every trailing window at once
+        hw = p['hurst_window']
+        hurst_raw = np.full((n_paths, n), 0.5)
+        for t0, t1 in self._window_chunks(n_paths, n, hw, hw, chunk_bytes):
+            win = sliding(r[:, t0 - hw + 1:t1], hw, axis=1)
+            Y = np.cumsum(win - win.mean(axis=2, keepdims=True), axis=2)
+            R = Y.max(axis=2) - Y.min(axis=2)
+            S = win.std(axis=2, ddof=1)
+            del Y
+            with np.errstate(divide='ignore', invalid='ignore'):
+                H = np.clip(np.log(R / S) / np.log(hw / 2), 0.01, 0.99)
+            hurst_raw[:, t0:t1] = np.where((S == 0) | (R == 0) | ~np.isfinite(H), 0.5, H)
+        hurst = np.clip(self._ewma_rows(hurst_raw, p['hurst_span']), 0.01, 0.99)
+
+        # 4. Entropy - rolling AR(1) autocorrelation over 20 bars
+        rho1 = np.zeros((n_paths, n))
+        for t0, t1 in self._window_chunks(n_paths, n, 19, 20, chunk_bytes):
+            win = sliding(r[:, t0 - 19:t1], 20, axis=1)
+            a = win[:, :, 1:] - win[:, :, 1:].mean(axis=2, keepdims=True)
+            b = win[:, :, :-1] - win[:, :, :-1].mean(axis=2, keepdims=True)
+            denom = np.sqrt((a * a).sum(axis=2) * (b * b).sum(axis=2))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rho1[:, t0:t1] = np.where(denom > 0, (a * b).sum(axis=2) / denom, 0.0)
+            del a, b
+        ent_sm = np.clip(self._ewma_rows(1 - np.abs(rho1), p['ent_span']), 0, 1)
+
+        # 5. Relationship - volume imbalance
+        if volumes is not None:
+            v = np.atleast_2d(np.asarray(volumes, dtype=np.float64))
+            vol_ma = self._rolling_mean_rows(v, 20)
+            vol_imbalance = np.clip(np.nan_to_num((v - vol_ma) / (vol_ma + eps)), -5, 5)
+        else:
+            vol_imbalance = np.zeros((n_paths, n))
+
+        # 6. Resolution - Expected Shortfall over every trailing window
+        lw = p['long_vol_window']
+        es = np.zeros((n_paths, n))
+        for t0, t1 in self._window_chunks(n_paths, n, lw, lw, chunk_bytes):
+            win = sliding(r[:, t0 - lw + 1:t1], lw, axis=1)
+            var_threshold = np.quantile(win, p['es_quantile'], axis=2, keepdims=True)
+            tail = win <= var_threshold
+            es[:, t0:t1] = np.abs((win * tail).sum(axis=2) / tail.sum(axis=2))
+            del tail
+        res_raw = es / (sigma_long + eps)
+        res_sm = self._ewma_rows(np.log1p(np.minimum(res_raw, 10.0)), p['res_span'])
+
+        # 7-9. Effective coefficients, Sigma_C and Sigma_R
+        ent_damped = 1 - p['z'] * ent_sm
+        alpha_eff = 1 + p['kappa'] * (hurst - 0.5) * ent_damped
+        beta_eff = 1 + p['lambda'] * (hurst - 0.5) * ent_damped
+        D = (
+            1
+            + alpha_eff * r**2
+            + beta_eff * vol_imbalance**2
+            + p['eta'] * trans_sm
+            + p['gamma_ent'] * ent_sm
+        )
+        sigma_C = np.clip((1 / D) ** (1 + p['mu'] * trans_sm), 1e-12, 1.0)
+        res_adjusted_inv = 1 / (sigma_C + eps) + p['gamma'] * res_sm
+        sigma_R = (1 / res_adjusted_inv) ** (1 + p['rho'] * res_sm)
+
+        return np.clip(sigma_R, 1e-12, 1.0)
+
+    def compute_sensitivities(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Analytic parameter sensitivities ∂Σ_R/∂θ for the eight scaling parameters.
+
+        Forward-mode derivatives are propagated through stages 7-9 (effective
+        coefficients, Σ_C and Σ_R) in one vectorized pass; stages 1-6 do not
+        depend on these parameters. Wherever a clip(1e-12, 1.0) bound is
+        active the corresponding gradient is exactly zero.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Output from compute() run with this calculator's parameters.
+            The stage 7-9 columns are recomputed from the stage 1-6 columns
+            and a ValueError is raised if they disagree (e.g. `df` came from
+            a calculator with different kappa, mu or rho).
+
+        Returns
+        -------
+        pd.DataFrame
+            Jacobian with the same index as `df` and one column per parameter:
+            kappa, lambda, z, eta, mu, gamma_ent, gamma, rho
+        """
+        p = self.params
+        eps = p['epsilon']
+
+        r2 = df['returns'].to_numpy()**2
+        v2 = df['vol_imbalance'].to_numpy()**2
+        H_centered = df['hurst'].to_numpy() - 0.5
+        ent = df['ent_sm'].to_numpy()
+        trans = df['trans_sm'].to_numpy()
+        res = df['res_sm'].to_numpy()
+        D = df['D'].to_numpy()
+        sigma_C = df['sigma_C'].to_numpy()
+        ent_damped = 1 - p['z'] * ent
+
+        # df must come from compute() with these parameters
+        expected_D = (
+            1
+            + (1 + p['kappa'] * H_centered * ent_damped) * r2
+            + (1 + p['lambda'] * H_centered * ent_damped) * v2
+            + p['eta'] * trans
+            + p['gamma_ent'] * ent
+        )
+        expected_C = np.clip((1 / D) ** (1 + p['mu'] * trans), 1e-12, 1.0)
+        expected_R = np.clip(
+            (1 / (1 / (sigma_C + eps) + p['gamma'] * res)) ** (1 + p['rho'] * res), 1e-12, 1.0
+        )
+        for column, expected in (('D', expected_D), ('sigma_C', expected_C),
+                                 ('sigma_R', expected_R)):
+            if not np.allclose(df[column].to_numpy(), expected, rtol=1e-9, atol=0, equal_nan=True):
+                raise ValueError(
+                    f"df['{column}'] does not match this calculator's parameters; "
+                    f"pass the output of compute() from the same calculator"
+                )
+
+        # Stage 7-8: ∂D/∂θ
+        dD = {
+            'kappa': H_centered * ent_damped * r2,
+            'lambda': H_centered * ent_damped * v2,
+            'z': -H_centered * ent * (p['kappa'] * r2 + p['lambda'] * v2),
+            'eta': trans,
+            'gamma_ent': ent,
+        }
+
+        # Σ_C = D^-(1 + μ·T)  =>  ∂Σ_C = Σ_C·(-(1 + μ·T)/D·∂D - T·ln D·∂μ)
+        exponent = 1 + p['mu'] * trans
+        sigma_C_raw = (1 / D) ** exponent
+        c_active = (sigma_C_raw >= 1e-12) & (sigma_C_raw <= 1.0)
+        dC = {k: -sigma_C_raw * exponent / D * v for k, v in dD.items()}
+        dC['mu'] = -sigma_C_raw * trans * np.log(D)
+        dC = {k: np.where(c_active, v, 0.0) for k, v in dC.items()}
+
+        # Stage 9: Σ_R = inv^-(1 + ρ·Res), inv = 1/(Σ_C + ε) + γ·Res
+        inv = 1 / (sigma_C + eps) + p['gamma'] * res
+        res_exponent = 1 + p['rho'] * res
+        sigma_R_raw = (1 / inv) ** res_exponent
+        r_active = (sigma_R_raw >= 1e-12) & (sigma_R_raw <= 1.0)
+
+        dinv = {k: -v / (sigma_C + eps)**2 for k, v in dC.items()}
+        dinv['gamma'] = res
+        jac = {k: -sigma_R_raw * res_exponent / inv * v for k, v in dinv.items()}
+        jac['rho'] = -sigma_R_raw * res * np.log(inv)
+
+        columns = ['kappa', 'lambda', 'z', 'eta', 'mu', 'gamma_ent', 'gamma', 'rho']
+        return pd.DataFrame(
+            {k: np.where(r_active, jac[k], 0.0) for k in columns},
+            index=df.index
+        )
+
     def compute_mmpa_features(self, df: pd.DataFrame) -> Dict:
         """
         Convert Sigma_R dataframe to MMPA-compatible feature structure.
@@ -534,21 +904,23 @@ if __name__ == "__main__":
     print("\n5. Crisis Event Analysis:")
     print("-" * 60)
 
-    # 2008 Financial Crisis
-    crisis_2008 = results.loc['2008-09-01':'2009-03-31']
-    if len(crisis_2008) > 0:
-        print(f"   2008 Crisis (Sep 2008 - Mar 2009):")
-        print(f"     Sigma_R min: {crisis_2008['sigma_R'].min():.4f} "
-              f"on {crisis_2008['sigma_R'].idxmin().date()}")
-        print(f"     Sigma_R mean: {crisis_2008['sigma_R'].mean():.4f}")
-
-    # 2020 COVID Crash
-    crisis_2020 = results.loc['2020-02-01':'2020-04-30']
-    if len(crisis_2020) > 0:
-        print(f"   2020 COVID (Feb 2020 - Apr 2020):")
-        print(f"     Sigma_R min: {crisis_2020['sigma_R'].min():.4f} "
-              f"on {crisis_2020['sigma_R'].idxmin().date()}")
-        print(f"     Sigma_R mean: {crisis_2020['sigma_R'].mean():.4f}")
+    from sigma_r_analytics import SigmaRIndex
+    index = SigmaRIndex(results['sigma_R'])
+
+    for name, (start, end) in CRISIS_PERIODS.items():
+        crisis = index.summary(start, end)
+        if crisis['count'] > 0:
+            span = f"{pd.Timestamp(start):%b %Y} - {pd.Timestamp(end):%b %Y}"
+            print(f"   {name} ({span}):")
+            print(f"     Sigma_R min: {crisis['min']:.4f} "
+                  f"on {crisis['min_date'].date()}")
+            print(f"     Sigma_R mean: {crisis['mean']:.4f}")
+
+    episodes = index.episodes(drop=0.5)
+    print(f"   Episodes >50% below 1-year median: {len(episodes)}")
+    for _, ep in episodes.iterrows():
+        print(f"     {ep['start'].date()} - {ep['end'].date()}: "
+              f"trough {ep['trough']:.4f} on {ep['trough_date'].date()}")
 
     # Export
     print("\n6. Exporting results...")
@@ -0,0 +1,292 @@
+"""
+Sigma_R Monte Carlo Confidence Bands
+====================================
+
+Resamples returns (moving-block or regime-aware block bootstrap), evaluates
+Σ_R for thousands of paths with SigmaRCalculator.compute_batch(), and reports
+per-date quantile bands plus a p-value for each crisis minimum.
+
+Paths are simulated in blocks sized from a per-worker memory budget and
+spread over worker processes to use every core. Each worker writes its
+block of Σ_R paths into a disk-backed float32 memmap and returns only its
+crisis-window minima; bands are then computed over time slices of the
+memmap, so no process ever holds the full (paths x time) matrix.
+
+Resampling methods:
+    - 'block': moving-block bootstrap over the whole history. Crisis timing
+      is scrambled, so the p-value answers "how often does a random path
+      dip this low inside the crisis window?"
+    - 'regime': blocks are drawn only from the same regime (calm vs each
+      crisis window, as in _generate_synthetic_spy_data), so the bands show
+      the uncertainty of Σ_R given the observed regime sequence.
+
+Author: Sigma_R Framework Team
+Date: 2025-11-05
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sigma_r_framework import CRISIS_PERIODS, SigmaRCalculator
+
+# Rough count of (paths x time) float64 arrays alive at once in
+# _simulate_block/compute_batch; used to size blocks from a memory budget
+_ROW_ARRAYS = 32
+
+
+def block_bootstrap_indices(
+    n: int,
+    n_paths: int,
+    block_len: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Moving-block bootstrap index matrix of shape (n_paths, n).
+
+    Each path is a concatenation of contiguous blocks of length `block_len`
+    with uniformly drawn start positions, truncated to `n`.
+    """
+    block_len = max(1, min(block_len, n))
+    n_blocks = -(-n // block_len)
+    starts = rng.integers(0, n - block_len + 1, size=(n_paths, n_blocks))
+    idx = starts[:, :, None] + np.arange(block_len)
+    return idx.reshape(n_paths, -1)[:, :n]
+
+
+def regime_labels(
+    index: pd.DatetimeIndex,
+    regimes: Optional[Dict[str, Tuple[str, str]]] = None
+) -> np.ndarray:
+    """Label each date with 0 (calm) or 1..k for the regime window it falls in."""
+    regimes = CRISIS_PERIODS if regimes is None else regimes
+    labels = np.zeros(len(index), dtype=np.int64)
+    for k, (start, end) in enumerate(regimes.values(), start=1):
+        labels[(index >= start) & (index <= end)] = k
+    return labels
+
+
+def regime_bootstrap_indices(
+    labels: np.ndarray,
+    n_paths: int,
+    block_len: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Regime-aware block bootstrap index matrix of shape (n_paths, n).
+
+    Positions of each regime are refilled with blocks drawn from that
+    regime's own observations, so crises stay where they happened.
+    """
+    idx = np.empty((n_paths, len(labels)), dtype=np.int64)
+    for label in np.unique(labels):
+        pool = np.flatnonzero(labels == label)
+        idx[:, pool] = pool[block_bootstrap_indices(len(pool), n_paths, block_len, rng)]
+    return idx
+
+
+def _simulate_block(args) -> np.ndarray:
+    """
+    Worker: resample one block of paths, evaluate Σ_R and store it (float32)
+    in rows [offset, offset + n_paths) of the shared memmap.
+
+    Returns the (n_paths x n_crises) minimum of each path over each crisis mask.
+    """
+    (calculator, returns, volumes, labels, masks, block_len, seeds,
+     store, shape, offset, chunk_bytes) = args
+    n_paths = len(seeds)
+
+    # One generator per path, so paths do not depend on how they are blocked
+    idx = np.empty((n_paths, len(returns)), dtype=np.int64)
+    for i, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        if labels is None:
+            idx[i] = block_bootstrap_indices(len(returns), 1, block_len, rng)[0]
+        else:
+            idx[i] = regime_bootstrap_indices(labels, 1, block_len, rng)[0]
+
+    r = returns[idx]
+    r[:, 0] = 0.0  # compute() convention: no return on the first bar
+    v = volumes[idx] if volumes is not None else None
+    del idx
+
+    sigma = calculator.compute_batch(r, v, chunk_bytes=chunk_bytes).astype(np.float32)
+    paths = np.memmap(store, dtype=np.float32, mode='r+', shape=shape)
+    paths[offset:offset + n_paths] = sigma
+    paths.flush()
+    del paths
+
+    mins = np.empty((n_paths, len(masks)), dtype=np.float32)
+    for k, mask in enumerate(masks):
+        mins[:, k] = sigma[:, mask].min(axis=1)
+    return mins
+
+
+def sigma_r_confidence_bands(
+    prices: pd.Series,
+    volumes: Optional[pd.Series] = None,
+    calculator: Optional[SigmaRCalculator] = None,
+    n_paths: int = 2000,
+    method: str = 'block',
+    block_len: int = 20,
+    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    crises: Optional[Dict[str, Tuple[str, str]]] = None,
+    block_size: Optional[int] = None,
+    memory_budget: int = 512 * 2**20,
+    scratch_dir: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+    seed: int = 42
+) -> Dict:
+    """
+    Monte Carlo confidence bands and crisis p-values for Σ_R.
+
+    Parameters
+    ----------
+    prices : pd.Series
+        Observed prices with a DatetimeIndex.
+    volumes : pd.Series, optional
+        Observed volumes; resampled jointly with returns.
+    calculator : SigmaRCalculator, optional
+        Calculator to evaluate (default parameters if None).
+    n_paths : int, default=2000
+        Number of simulated paths.
+    method : {'block', 'regime'}, default='block'
+        Resampling scheme (see module docstring).
+    block_len : int, default=20
+        Bootstrap block length in bars.
+    quantiles : sequence of float
+        Quantiles reported for every date.
+    crises : dict, optional
+        Name -> (start, end) windows to test (default: CRISIS_PERIODS).
+        Also defines the regimes for method='regime'.
+    block_size : int, optional
+        Paths per batched evaluation (default: derived from memory_budget
+        and the series length, at least 1).
+    memory_budget : int, default=512 MiB
+        Approximate working memory per worker process, in bytes.
+    scratch_dir : str, optional
+        Directory for the temporary path memmap (default: system temp dir).
+    n_jobs : int, optional
+        Worker processes (default: all cores; 1 runs inline).
+    seed : int, default=42
+        Seed for reproducible resampling. Each path gets its own child
+        seed, so results do not depend on block_size, memory_budget or n_jobs.
+
+    Returns
+    -------
+    dict
+        - observed: Σ_R of the observed series (pd.Series)
+        - bands: per-date quantiles (pd.DataFrame, one column per quantile)
+        - crises: per-crisis observed minimum, its date, the path-minimum
+          quantiles and the p-value P(path min <= observed min)
+        - n_paths: number of simulated paths
+    """
+    assert method in ('block', 'regime'), "method must be 'block' or 'regime'"
+    calculator = SigmaRCalculator() if calculator is None else calculator
+    crises = CRISIS_PERIODS if crises is None else crises
+
+    returns = np.log(prices / prices.shift(1)).fillna(0).to_numpy(dtype=np.float64)
+    vols = volumes.to_numpy(dtype=np.float64) if volumes is not None else None
+    labels = regime_labels(prices.index, crises) if method == 'regime' else None
+
+    observed = pd.Series(
+        calculator.compute_batch(returns[None, :], None if vols is None else vols[None, :])[0],
+        index=prices.index, name='sigma_R'
+    )
+
+    n = len(returns)
+    if block_size is None:
+        block_size = max(1, memory_budget // (8 * n * _ROW_ARRAYS))
+    block_size = min(block_size, n_paths)
+    chunk_bytes = max(memory_budget // 8, 1)
+
+    names, masks = [], []
+    for name, (start, end) in crises.items():
+        mask = (prices.index >= start) & (prices.index <= end)
+        if mask.any():
+            names.append(name)
+            masks.append(mask)
+
+    # One seed per path: results depend on `seed` only, not on block_size
+    # or memory_budget
+    seeds = np.random.SeedSequence(seed).spawn(n_paths)
+    offsets = range(0, n_paths, block_size)
+
+    with tempfile.TemporaryDirectory(dir=scratch_dir) as tmp:
+        store = os.path.join(tmp, 'paths.f32')
+        shape = (n_paths, n)
+        np.memmap(store, dtype=np.float32, mode='w+', shape=shape).flush()
+        tasks = [
+            (calculator, returns, vols, labels, masks, block_len,
+             seeds[offset:offset + block_size], store, shape, offset, chunk_bytes)
+            for offset in offsets
+        ]
+
+        n_jobs = (os.cpu_count() or 1) if n_jobs is None else n_jobs
+        if n_jobs == 1:
+            path_mins = [_simulate_block(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                path_mins = list(pool.map(_simulate_block, tasks))
+        path_mins = np.concatenate(path_mins, axis=0)
+
+        # Quantiles over time slices of at most ~memory_budget bytes
+        paths = np.memmap(store, dtype=np.float32, mode='r', shape=shape)
+        step = max(1, memory_budget // (16 * n_paths))
+        band_values = np.empty((n, len(quantiles)))
+        for t0 in range(0, n, step):
+            t1 = min(n, t0 + step)
+            band_values[t0:t1] = np.quantile(np.asarray(paths[:, t0:t1]), quantiles, axis=0).T
+        del paths
+
+    bands = pd.DataFrame(
+        band_values,
+        index=prices.index,
+        columns=[f'q{q:g}' for q in quantiles]
+    )
+
+    rows = []
+    for k, (name, mask) in enumerate(zip(names, masks)):
+        window = observed[mask]
+        mins = path_mins[:, k]
+        obs_min = window.min()
+        rows.append({
+            'crisis': name,
+            'observed_min': obs_min,
+            'observed_date': window.idxmin(),
+            'path_min_q05': np.quantile(mins, 0.05),
+            'path_min_q50': np.quantile(mins, 0.5),
+            'path_min_q95': np.quantile(mins, 0.95),
+            'p_value': (1 + np.sum(mins <= obs_min)) / (len(mins) + 1)
+        })
+
+    return {
+        'observed': observed,
+        'bands': bands,
+        'crises': pd.DataFrame(rows).set_index('crisis') if rows else pd.DataFrame(),
+        'n_paths': n_paths
+    }
+
+
+if __name__ == "__main__":
+    from sigma_r_framework import download_spy_data
+
+    print("Sigma_R Monte Carlo Confidence Bands")
+    print("=" * 60)
+    spy_data = download_spy_data('2007-01-01', '2024-12-31')
+
+    for method in ('block', 'regime'):
+        mc = sigma_r_confidence_bands(
+            spy_data['Close'], spy_data['Volume'], n_paths=1000, method=method
+        )
+        print(f"\n{method} bootstrap ({mc['n_paths']} paths):")
+        print("-" * 60)
+        for name, row in mc['crises'].iterrows():
+            print(f"   {name}: min={row['observed_min']:.4f} "
+                  f"on {row['observed_date'].date()}, "
+                  f"path-min 90% band=[{row['path_min_q05']:.4f}, {row['path_min_q95']:.4f}], "
+                  f"p={row['p_value']:.4f}")
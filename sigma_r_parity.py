@@ -0,0 +1,536 @@
+"""
+Sigma_R Cross-Language Parity Harness
+=====================================
+
+Exports the full-length Python reference series (inputs plus every
+intermediate column of SigmaRCalculator.compute()) in a compact, chunked
+binary format that the JS port can stream, and checks a candidate series
+against it with per-column tolerances, reporting the first divergent row
+and the pipeline stage it belongs to.
+
+Binary Layout (little-endian, version 1, extension .srpb):
+
+    File header
+        Offset  Size  Type      Field
+             0     8  char[8]   magic = b"SIGMARP1"
+             8     4  uint32    version (1)
+            12     4  uint32    n_cols
+            16     8  uint64    n_rows
+            24     4  uint32    chunk_rows (rows per full chunk)
+            28     4  uint32    schema_len (bytes of UTF-8 JSON at offset 32)
+            32     *  utf-8     schema JSON: {"columns": [...]}, space-padded
+                                so the first chunk starts on an 8-byte boundary
+
+    Chunk (repeated until n_rows are covered)
+             0     8  uint64    row_start
+             8     4  uint32    n (rows in this chunk)
+            12     4  uint32    reserved (zero)
+            16   8*n  int64     timestamps (ns since epoch)
+             *  8*n*c float64   column-major values: column 0 rows, column 1 rows, ...
+
+Every field is 8-byte aligned, so a JS reader can map each column with
+``new Float64Array(buffer, offset, n)`` while streaming chunk by chunk.
+
+Usage:
+    python sigma_r_parity.py export --out spy_sigma_r_reference.srpb
+    python sigma_r_parity.py check spy_sigma_r_reference.srpb js_output.csv
+    python sigma_r_parity.py check ref.srpb js_output.srpb --tol hurst=1e-8:1e-6
+
+Author: Sigma_R Framework Team
+Date: 2025-11-05
+"""
+
+import argparse
+import json
+import struct
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"SIGMARP1"
+VERSION = 1
+DEFAULT_CHUNK_ROWS = 65536
+
+_HEADER_FMT = "<8sIIQII"
+_CHUNK_FMT = "<QII"
+_HEADER_SIZE = struct.calcsize(_HEADER_FMT)
+_CHUNK_HEADER_SIZE = struct.calcsize(_CHUNK_FMT)
+
+# Pipeline stage of every exported column (stage numbers follow compute())
+COLUMN_STAGES = {
+    'price': 0, 'volume': 0, 'returns': 0,
+    'sigma_short': 1, 'sigma_long': 1,
+    'trans_raw': 2, 'trans_sm': 2,
+    'hurst_raw': 3, 'hurst': 3,
+    'ent_raw': 4, 'ent_sm': 4,
+    'vol_imbalance': 5,
+    'es': 6, 'res_raw': 6, 'res_sm': 6,
+    'alpha_eff': 7, 'beta_eff': 7,
+    'D': 8, 'sigma_C': 8,
+    'sigma_R': 9,
+}
+
+STAGE_NAMES = {
+    0: 'Inputs & log returns',
+    1: 'Realized volatility',
+    2: 'Transformation',
+    3: 'Complexity (Hurst)',
+    4: 'Entropy',
+    5: 'Relationship (volume imbalance)',
+    6: 'Resolution (Expected Shortfall)',
+    7: 'Effective coefficients',
+    8: 'Core stability (Sigma_C)',
+    9: 'Resolution-adjusted stability (Sigma_R)',
+}
+
+# (atol, rtol) per column; anything not listed uses DEFAULT_TOLERANCE
+DEFAULT_TOLERANCE = (1e-9, 1e-6)
+DEFAULT_TOLERANCES = {
+    'price': (1e-6, 1e-9),
+    'volume': (1e-3, 1e-9),
+}
+
+
+# ===================================================================
+# Writing
+# ===================================================================
+
+def write_parity_file(
+    path: str,
+    frame: pd.DataFrame,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+):
+    """
+    Write a DataFrame with a DatetimeIndex to the chunked binary format.
+
+    Parameters
+    ----------
+    path : str
+        Output path (.srpb).
+    frame : pd.DataFrame
+        Numeric columns to export, in order.
+    chunk_rows : int, default=65536
+        Rows per chunk.
+    """
+    columns = list(frame.columns)
+    values = frame.to_numpy(dtype='<f8')
+    stamps = pd.DatetimeIndex(frame.index).as_unit('ns').asi8.astype('<i8')
+    n_rows = len(frame)
+
+    schema = json.dumps({'columns': columns}).encode('utf-8')
+    schema += b' ' * (-(_HEADER_SIZE + len(schema)) % 8)
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack(
+            _HEADER_FMT, MAGIC, VERSION, len(columns), n_rows, chunk_rows, len(schema)
+        ))
+        f.write(schema)
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            f.write(struct.pack(_CHUNK_FMT, start, stop - start, 0))
+            f.write(stamps[start:stop].tobytes())
+            f.write(np.ascontiguousarray(values[start:stop].T).tobytes())
+
+
+def reference_frame(
+    results: pd.DataFrame,
+    prices: pd.Series,
+    volumes: Optional[pd.Series] = None
+) -> pd.DataFrame:
+    """
+    Inputs plus every compute() column, in pipeline order.
+
+    `volume` is only included when volumes are given; without it the
+    reference's vol_imbalance is all zeros, as in compute().
+    """
+    frame = pd.DataFrame(index=results.index)
+    frame['price'] = prices.reindex(results.index)
+    if volumes is not None:
+        frame['volume'] = volumes.reindex(results.index)
+    for column in COLUMN_STAGES:
+        if column in results.columns:
+            frame[column] = results[column]
+    return frame
+
+
+def export_reference(
+    path: str,
+    prices: pd.Series,
+    volumes: Optional[pd.Series] = None,
+    calculator=None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """Run compute() on the full series and write the parity reference."""
+    from sigma_r_framework import SigmaRCalculator
+
+    calculator = SigmaRCalculator() if calculator is None else calculator
+    frame = reference_frame(calculator.compute(prices, volumes), prices, volumes)
+    write_parity_file(path, frame, chunk_rows)
+    return frame
+
+
+# ===================================================================
+# Reading
+# ===================================================================
+
+class ParityReader:
+    """
+    Memory-mapped reader for .srpb files.
+
+    Chunks are located once from their headers; reads of any row range
+    are served as views/slices of the mapping.
+    """
+
+    def __init__(self, path: str):
+        self._mm = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version, n_cols, n_rows, chunk_rows, schema_len = struct.unpack_from(
+            _HEADER_FMT, self._mm, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Sigma_R parity file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported parity file version {version}")
+
+        schema = bytes(self._mm[_HEADER_SIZE:_HEADER_SIZE + schema_len])
+        self.columns: List[str] = json.loads(schema)['columns']
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+
+        # (row_start, n, byte offset of timestamps)
+        self._chunks = []
+        offset = _HEADER_SIZE + schema_len
+        while offset < len(self._mm):
+            row_start, n, _ = struct.unpack_from(_CHUNK_FMT, self._mm, offset)
+            self._chunks.append((row_start, n, offset + _CHUNK_HEADER_SIZE))
+            offset += _CHUNK_HEADER_SIZE + 8 * n * (n_cols + 1)
+        self._starts = np.array([c[0] for c in self._chunks], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def _chunk_arrays(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        _, n, offset = self._chunks[i]
+        stamps = np.frombuffer(self._mm, dtype='<i8', count=n, offset=offset)
+        values = np.frombuffer(
+            self._mm, dtype='<f8', count=n * self.n_cols, offset=offset + 8 * n
+        ).reshape(self.n_cols, n)
+        return stamps, values
+
+    def read_rows(self, start: int, stop: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Timestamps and column -> values for rows [start, stop)."""
+        first = max(int(np.searchsorted(self._starts, start, 'right')) - 1, 0)
+        stamps, values = [], []
+        for i in range(first, len(self._chunks)):
+            row_start, n, _ = self._chunks[i]
+            if row_start >= stop:
+                break
+            lo, hi = max(start - row_start, 0), min(stop - row_start, n)
+            s, v = self._chunk_arrays(i)
+            stamps.append(s[lo:hi])
+            values.append(v[:, lo:hi])
+        if len(values) == 1:
+            stamp, value = stamps[0], values[0]
+        elif values:
+            stamp, value = np.concatenate(stamps), np.concatenate(values, axis=1)
+        else:
+            stamp, value = np.empty(0, '<i8'), np.empty((self.n_cols, 0))
+        return stamp, dict(zip(self.columns, value))
+
+    def iter_blocks(self, block_rows: int) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """Yield (row_start, column -> values) blocks of `block_rows` rows."""
+        for start in range(0, self.n_rows, block_rows):
+            _, block = self.read_rows(start, min(start + block_rows, self.n_rows))
+            yield start, block
+
+    def to_frame(self) -> pd.DataFrame:
+        """Load the whole file as a DataFrame (small files / debugging)."""
+        stamps, values = self.read_rows(0, self.n_rows)
+        return pd.DataFrame(values, index=pd.to_datetime(stamps))
+
+
+# Candidate CSV columns recognised as row timestamps (case-insensitive);
+# dates as strings, or numbers as Unix milliseconds
+TIMESTAMP_COLUMNS = ('date', 'datetime', 'timestamp', 'time')
+
+
+def _csv_timestamp_column(columns: List[str], numeric: List[str]) -> Optional[str]:
+    """Named date/timestamp column, else a non-numeric first column (a saved index)."""
+    for column in columns:
+        if str(column).lower() in TIMESTAMP_COLUMNS:
+            return column
+    if len(columns) and columns[0] not in numeric:
+        return columns[0]
+    return None
+
+
+def _iter_csv_blocks(path: str, block_rows: int):
+    """Yield (row_start, n, ns timestamps or None, column -> values) from a candidate CSV."""
+    start = 0
+    stamp_column = None
+    for chunk in pd.read_csv(path, chunksize=block_rows):
+        numeric = chunk.select_dtypes(include=[np.number])
+        if start == 0:
+            stamp_column = _csv_timestamp_column(list(chunk.columns), list(numeric.columns))
+        stamps = None
+        if stamp_column is not None:
+            column = chunk[stamp_column]
+            # Numeric timestamps are JS Date.getTime() milliseconds
+            unit = 'ms' if pd.api.types.is_numeric_dtype(column) else None
+            parsed = pd.to_datetime(column, unit=unit, utc=True, errors='coerce')
+            stamps = pd.DatetimeIndex(parsed).as_unit('ns').asi8
+        values = {c: numeric[c].to_numpy(dtype=np.float64)
+                  for c in numeric.columns if c != stamp_column}
+        yield start, len(chunk), stamps, values
+        start += len(chunk)
+
+
+def _iter_srpb_blocks(path: str, block_rows: int):
+    """Yield (row_start, n, ns timestamps, column -> values) from a candidate .srpb."""
+    reader = ParityReader(path)
+    for start in range(0, reader.n_rows, block_rows):
+        stop = min(start + block_rows, reader.n_rows)
+        stamps, values = reader.read_rows(start, stop)
+        yield start, stop - start, stamps, values
+
+
+# ===================================================================
+# Checking
+# ===================================================================
+
+def check_parity(
+    reference_path: str,
+    candidate_path: str,
+    tolerances: Optional[Dict[str, Tuple[float, float]]] = None,
+    columns: Optional[List[str]] = None,
+    block_rows: int = DEFAULT_CHUNK_ROWS
+) -> Dict:
+    """
+    Compare a candidate series against the reference, block by block.
+
+    A value passes when |candidate - reference| <= atol + rtol * |reference|;
+    NaN matches NaN. Candidate columns are matched by name (CSV or .srpb).
+    Rows are matched by position and their timestamps must agree (a CSV's
+    date/timestamp column, or the .srpb chunk timestamps); the first
+    mismatch is reported as a stage-0 divergence. The candidate must have
+    exactly as many rows as the reference.
+    Every checked column must be present in the candidate: all reference
+    columns by default, or just `columns` when given, so a JS export that
+    implements only some stages must name them explicitly.
+
+    Parameters
+    ----------
+    reference_path : str
+        Reference .srpb written by export_reference().
+    candidate_path : str
+        Candidate .srpb or .csv.
+    tolerances : dict, optional
+        Column -> (atol, rtol) overrides of DEFAULT_TOLERANCES.
+    columns : list of str, optional
+        Restrict the check to these reference columns.
+    block_rows : int, default=65536
+        Rows compared per block.
+
+    Returns
+    -------
+    dict
+        - ok: True if every checked column is present, the candidate has
+          the reference's rows and timestamps, and every value is within
+          tolerance
+        - rows_checked: number of rows compared
+        - reference_rows: number of rows in the reference
+        - candidate_rows: number of rows in the candidate
+        - timestamps_checked: False if a CSV candidate had no date column
+          (rows were then matched by position only)
+        - columns: per-column DataFrame (stage, atol, rtol, max_abs_err, failures)
+        - missing: checked columns absent from the candidate
+        - unmatched: candidate columns that are not reference columns
+        - first_divergence: None, or the earliest failing row with its
+          date, column, stage, stage_name, reference, candidate and abs_err
+          (ties on the same row resolve to the earliest stage)
+    """
+    tol = dict(DEFAULT_TOLERANCES)
+    tol.update(tolerances or {})
+
+    reference = ParityReader(reference_path)
+    if candidate_path.endswith('.csv'):
+        blocks = _iter_csv_blocks(candidate_path, block_rows)
+    else:
+        blocks = _iter_srpb_blocks(candidate_path, block_rows)
+
+    wanted = list(columns) if columns is not None else reference.columns
+    unknown = [c for c in wanted if c not in reference.columns]
+    if unknown:
+        raise ValueError(f"Not reference columns: {', '.join(unknown)}")
+    stats = {c: {'max_abs_err': 0.0, 'failures': 0} for c in wanted}
+    missing = set(wanted)
+    unmatched = set()
+    first = None
+    rows_checked = candidate_rows = 0
+    timestamps_checked = True
+
+    for start, n, cand_stamps, cand in blocks:
+        candidate_rows = start + n
+        stop = min(start + n, reference.n_rows)
+        if stop <= start:
+            continue  # extra candidate rows: counted, nothing to compare
+        stamps, ref = reference.read_rows(start, stop)
+        rows_checked = stop
+        unmatched.update(c for c in cand if c not in reference.columns)
+
+        if cand_stamps is None:
+            timestamps_checked = False
+        elif first is None:
+            # Blocks arrive in row order, so an earlier block's divergence
+            # always wins; within a block the timestamp wins stage-0 ties
+            moved = np.flatnonzero(cand_stamps[:stop - start] != stamps)
+            if len(moved):
+                i = int(moved[0])
+                ref_date, cand_date = pd.Timestamp(stamps[i]), pd.Timestamp(cand_stamps[i])
+                first = {
+                    'row': start + i,
+                    'date': ref_date,
+                    'column': 'timestamp',
+                    'stage': 0,
+                    'stage_name': STAGE_NAMES[0],
+                    'reference': ref_date,
+                    'candidate': cand_date,
+                    'abs_err': np.inf if pd.isna(cand_date)
+                    else abs((cand_date - ref_date).total_seconds()),
+                }
+
+        for column in wanted:
+            if column not in cand:
+                continue
+            missing.discard(column)
+            r = ref[column]
+            c = cand[column][:stop - start]
+            atol, rtol = tol.get(column, DEFAULT_TOLERANCE)
+            with np.errstate(invalid='ignore'):
+                err = np.abs(c - r)
+                bad = ~((err <= atol + rtol * np.abs(r)) | (np.isnan(r) & np.isnan(c)))
+            if not bad.any():
+                if np.isfinite(err).any():
+                    stats[column]['max_abs_err'] = max(
+                        stats[column]['max_abs_err'], float(np.nanmax(err))
+                    )
+                continue
+
+            stats[column]['failures'] += int(bad.sum())
+            finite = err[np.isfinite(err)]
+            if len(finite):
+                stats[column]['max_abs_err'] = max(stats[column]['max_abs_err'], float(finite.max()))
+
+            i = int(np.argmax(bad))
+            row = start + i
+            stage = COLUMN_STAGES.get(column, -1)
+            if first is None or (row, stage) < (first['row'], first['stage']):
+                first = {
+                    'row': row,
+                    'date': pd.Timestamp(stamps[i]),
+                    'column': column,
+                    'stage': stage,
+                    'stage_name': STAGE_NAMES.get(stage, 'unknown'),
+                    'reference': float(r[i]),
+                    'candidate': float(c[i]),
+                    'abs_err': float(err[i]),
+                }
+
+    summary = pd.DataFrame.from_dict(stats, orient='index')
+    summary.insert(0, 'stage', [COLUMN_STAGES.get(c, -1) for c in summary.index])
+    summary.insert(1, 'atol', [tol.get(c, DEFAULT_TOLERANCE)[0] for c in summary.index])
+    summary.insert(2, 'rtol', [tol.get(c, DEFAULT_TOLERANCE)[1] for c in summary.index])
+    summary = summary.drop(index=[c for c in summary.index if c in missing])
+
+    return {
+        'ok': (
+            first is None and not missing and len(summary) > 0
+            and candidate_rows == reference.n_rows
+        ),
+        'rows_checked': rows_checked,
+        'reference_rows': reference.n_rows,
+        'candidate_rows': candidate_rows,
+        'timestamps_checked': timestamps_checked,
+        'columns': summary,
+        'missing': sorted(
+            missing, key=lambda c: (COLUMN_STAGES.get(c, -1), wanted.index(c))
+        ),
+        'unmatched': sorted(unmatched),
+        'first_divergence': first,
+    }
+
+
+def _parse_tolerances(specs: List[str]) -> Dict[str, Tuple[float, float]]:
+    """Parse ['col=atol:rtol', 'col=atol'] into a tolerance dict."""
+    out = {}
+    for spec in specs:
+        column, values = spec.split('=', 1)
+        parts = values.split(':')
+        atol = float(parts[0])
+        rtol = float(parts[1]) if len(parts) > 1 else DEFAULT_TOLERANCE[1]
+        out[column] = (atol, rtol)
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Sigma_R Python/JS parity harness.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export = sub.add_parser('export', help='Write the full-length Python reference')
+    export.add_argument('--out', default='spy_sigma_r_reference.srpb')
+    export.add_argument('--start', default='2007-01-01')
+    export.add_argument('--end', default='2024-12-31')
+    export.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+
+    check = sub.add_parser('check', help='Compare a candidate against the reference')
+    check.add_argument('reference')
+    check.add_argument('candidate', help='.srpb or .csv with matching column names')
+    check.add_argument('--tol', action='append', default=[], metavar='COL=ATOL[:RTOL]')
+    check.add_argument('--columns', nargs='+', default=None,
+                       help='Only check these columns (default: every reference column '
+                            'must be present in the candidate)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        from sigma_r_framework import download_spy_data
+
+        data = download_spy_data(args.start, args.end)
+        frame = export_reference(args.out, data['Close'], data['Volume'],
+                                 chunk_rows=args.chunk_rows)
+        print(f"✅ Exported {len(frame)} rows x {frame.shape[1]} columns to {args.out}")
+        return 0
+
+    try:
+        report = check_parity(args.reference, args.candidate,
+                              _parse_tolerances(args.tol), args.columns)
+    except ValueError as e:
+        parser.error(str(e))
+    if len(report['columns']):
+        print(report['columns'].to_string())
+    if not report['timestamps_checked']:
+        print("\n⚠️  Candidate has no date/timestamp column; rows matched by position only")
+    if report['unmatched']:
+        print(f"\n⚠️  Ignored candidate columns: {', '.join(report['unmatched'])}")
+
+    first = report['first_divergence']
+    if len(report['columns']) == 0:
+        print("\n❌ No reference columns found in candidate; nothing was compared")
+    elif report['missing']:
+        print(f"\n❌ Missing from candidate: {', '.join(report['missing'])} "
+              f"(pass --columns to check a subset)")
+    if first is not None:
+        print(f"\n❌ First divergence at row {first['row']} ({first['date'].date()}), "
+              f"stage {first['stage']} – {first['stage_name']}")
+        print(f"   {first['column']}: reference={first['reference']!r} "
+              f"candidate={first['candidate']!r} abs_err={first['abs_err']:.3e}")
+    elif report['candidate_rows'] != report['reference_rows']:
+        print(f"\n❌ Candidate has {report['candidate_rows']} rows; "
+              f"reference has {report['reference_rows']}")
+    elif report['ok']:
+        print(f"\n✅ {report['rows_checked']} rows within tolerance")
+    return 0 if report['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
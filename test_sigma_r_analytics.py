@@ -0,0 +1,53 @@
+"""
+Tests for the Σ_R crisis/regime query layer (sigma_r_analytics.py).
+
+Run with: python -m pytest -q test_sigma_r_analytics.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigma_r_analytics import SigmaRIndex, SigmaRUniverse, symbol_labels
+
+
+def _series(index, seed=0):
+    return pd.Series(np.random.default_rng(seed).random(len(index)), index=index, name='sigma_R')
+
+
+@pytest.mark.parametrize('tz', [None, 'America/New_York'])
+def test_range_min_matches_loc(tz):
+    s = _series(pd.date_range('2020-02-20 09:30', periods=5000, freq='5min', tz=tz))
+    index = SigmaRIndex(s, baseline_window=50)
+    for start, end in [('2020-03-02', '2020-03-02'), ('2020-03', '2020-03-09'), (None, '2020-02-25')]:
+        window = s.loc[start:end]
+        assert index.range_min(start, end) == (window.idxmin(), window.min())
+        assert index.summary(start, end)['count'] == len(window)
+
+    episodes = index.episodes(0.5)
+    assert len(episodes) and episodes['start'].dt.tz == s.index.tz
+
+
+def test_unsorted_index_is_sorted():
+    s = _series(pd.bdate_range('2008-01-01', periods=600))
+    index = SigmaRIndex(s.sample(frac=1, random_state=1))
+    window = s.loc['2008-09':'2009-03']
+    assert index.range_min('2008-09', '2009-03') == (window.idxmin(), window.min())
+
+
+def test_from_csv_labels(tmp_path):
+    paths = []
+    for folder, seed in (('a', 0), ('b', 1)):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / 'spy_sigma_r_backtest.csv'
+        _series(pd.bdate_range('2008-01-01', periods=300), seed).to_frame().to_csv(path)
+        paths.append(str(path))
+    paths.append(str(tmp_path / 'qqq_sigma_r_backtest.csv'))
+    _series(pd.bdate_range('2008-01-01', periods=300), 2).to_frame().to_csv(paths[-1])
+
+    universe = SigmaRUniverse.from_csv(paths)
+    assert universe.symbols == ['A_SPY', 'B_SPY', 'QQQ']
+    assert universe.range_min().loc['A_SPY', 'min'] != universe.range_min().loc['B_SPY', 'min']
+
+    with pytest.raises(ValueError, match='both map'):
+        symbol_labels([paths[0], paths[0]])
@@ -0,0 +1,126 @@
+"""
+Tests for the Σ_R memory-mapped ring feed (sigma_r_feed.py).
+
+Run with: python -m pytest -q test_sigma_r_feed.py
+"""
+
+import numpy as np
+
+from sigma_r_feed import META_COLUMNS, SigmaRFeedReader, SigmaRFeedWriter
+
+
+def _rows(start, n, n_cols):
+    """Rows whose every value is their publish index."""
+    return np.repeat(np.arange(start, start + n, dtype=np.float64)[:, None], n_cols, axis=1)
+
+
+def test_read_since_wraparound(tmp_path):
+    path = str(tmp_path / 'feed.bin')
+    with SigmaRFeedWriter(path, capacity=8, columns=['sigma_R'], include_mmpa=False) as writer, \
+            SigmaRFeedReader(path) as reader:
+        assert reader.columns == list(META_COLUMNS) + ['sigma_R']
+
+        writer.publish_rows(_rows(0, 5, writer.n_cols))
+        rows, seq = reader.read_since(0)
+        assert seq == 5
+        np.testing.assert_array_equal(rows[:, 0], np.arange(5))
+
+        # 14 more rows wrap the 8-slot ring; only the newest 8 survive
+        writer.publish_rows(_rows(5, 6, writer.n_cols))
+        writer.publish_rows(_rows(11, 8, writer.n_cols))
+        rows, seq = reader.read_since(seq)
+        assert seq == 19
+        np.testing.assert_array_equal(rows[:, 0], np.arange(11, 19))
+
+        # A single publish larger than the ring keeps its newest rows
+        writer.publish_rows(_rows(19, 20, writer.n_cols))
+        rows, seq = reader.read_since(seq)
+        assert seq == 39
+        np.testing.assert_array_equal(rows[:, 0], np.arange(31, 39))
+
+        assert len(reader.read_since(seq)[0]) == 0
+        assert reader.latest(3)['sigma_R'].tolist() == [36.0, 37.0, 38.0]
+
+
+def test_writer_restart_same_layout_continues(tmp_path):
+    path = str(tmp_path / 'feed.bin')
+    kwargs = dict(capacity=8, symbols=['SPY'], columns=['sigma_R'], include_mmpa=False)
+    writer = SigmaRFeedWriter(path, **kwargs)
+    writer.publish_rows(_rows(0, 5, writer.n_cols))
+    epoch = writer.epoch
+
+    with SigmaRFeedReader(path) as reader:
+        _, seq = reader.read_since(0)
+        writer.close()
+
+        with SigmaRFeedWriter(path, **kwargs) as writer:
+            assert writer.epoch == epoch
+            assert writer.write_seq == 5
+            writer.publish_rows(_rows(5, 2, writer.n_cols))
+
+            rows, seq = reader.read_since(seq)
+            assert seq == 7
+            np.testing.assert_array_equal(rows[:, 0], [5, 6])
+
+
+def test_writer_restart_new_layout_remaps_reader(tmp_path):
+    path = str(tmp_path / 'feed.bin')
+    writer = SigmaRFeedWriter(path, capacity=64, include_mmpa=True)
+    writer.publish_rows(_rows(0, 50, writer.n_cols))
+
+    with SigmaRFeedReader(path) as reader:
+        _, seq = reader.read_since(0)
+        assert seq == 50
+        writer.close()
+
+        # Smaller file, fewer columns, sequence restarts at 0
+        with SigmaRFeedWriter(path, capacity=4, columns=['sigma_R', 'hurst'],
+                              include_mmpa=False) as writer:
+            writer.publish_rows([[1.0, 0.0, 0.25, 0.5], [2.0, 0.0, 0.75, 0.5]])
+
+            rows, seq = reader.read_since(seq)
+            assert seq == 2
+            assert reader.epoch == writer.epoch
+            assert reader.columns == list(META_COLUMNS) + ['sigma_R', 'hurst']
+            np.testing.assert_array_equal(rows[:, 2], [0.25, 0.75])
+
+            latest = reader.latest()
+            assert latest.shape == (1, 4)
+            assert latest['sigma_R'].iloc[0] == 0.75
+
+
+def test_writer_restart_new_layout_without_replace(tmp_path, monkeypatch):
+    """Windows fallback: the file cannot be replaced while a reader has it open."""
+    path = str(tmp_path / 'feed.bin')
+    writer = SigmaRFeedWriter(path, capacity=4, columns=['sigma_R'], include_mmpa=False)
+    writer.publish_rows(_rows(0, 3, writer.n_cols))
+
+    with SigmaRFeedReader(path) as reader:
+        _, seq = reader.read_since(0)
+        writer.close()
+
+        def replace(src, dst):
+            raise PermissionError(13, 'file in use', dst)
+        monkeypatch.setattr('sigma_r_feed.os.replace', replace)
+
+        # Larger layout: the file grows in place and gets a new epoch
+        with SigmaRFeedWriter(path, capacity=16, columns=['sigma_R', 'hurst'],
+                              include_mmpa=False) as writer:
+            assert writer.epoch != reader.epoch
+            writer.publish_rows([[1.0, 0.0, 0.25, 0.5]])
+
+            rows, seq = reader.read_since(seq)
+            assert seq == 1
+            assert reader.capacity == 16
+            assert reader.columns == list(META_COLUMNS) + ['sigma_R', 'hurst']
+            np.testing.assert_array_equal(rows, [[1.0, 0.0, 0.25, 0.5]])
+        assert not list(tmp_path.glob('*.tmp'))
+
+        # Smaller layout again: the file keeps its size, readers still remap
+        with SigmaRFeedWriter(path, capacity=2, columns=['sigma_R'],
+                              include_mmpa=False) as writer:
+            writer.publish_rows(_rows(0, 3, writer.n_cols))
+            rows, seq = reader.read_since(seq)
+            assert seq == 3
+            assert reader.capacity == 2
+            np.testing.assert_array_equal(rows[:, 2], [1, 2])
@@ -0,0 +1,74 @@
+"""
+Tests for the rolling-volatility engine of sigma_r_framework.py.
+
+Run with: python -m pytest -q test_sigma_r_framework.py
+"""
+
+import numpy as np
+import pandas as pd
+
+import sigma_r_framework
+from sigma_r_framework import SigmaRCalculator, _generate_synthetic_spy_data
+
+
+def _exact_std(r, w, chunk=20000):
+    """Two-pass rolling std (ddof=1), NaN for warm-up or non-finite windows."""
+    out = np.full(len(r), np.nan)
+    sliding = np.lib.stride_tricks.sliding_window_view
+    for j in range(w - 1, len(r), chunk):
+        windows = sliding(r[j - w + 1:j + chunk], w)
+        out[j:j + len(windows)] = windows.std(axis=1, ddof=1)
+    return out
+
+
+def _assert_close(vol, exact, rtol):
+    np.testing.assert_array_equal(np.isnan(vol), np.isnan(exact))
+    np.testing.assert_allclose(vol, exact, rtol=rtol, atol=0)
+
+
+def test_realized_volatility_long_series():
+    # Minute-like series with a quiet stretch and a run of zero returns
+    rng = np.random.default_rng(7)
+    n = 1_000_000
+    r = rng.standard_normal(n) * 1e-3
+    r[500_000:500_100] = rng.standard_normal(100) * 1e-6
+    r[700_000:700_050] = 0.0
+
+    windows = [5, 100]
+    vol = SigmaRCalculator().realized_volatility(pd.Series(r), windows)
+    for w in windows:
+        exact = _exact_std(r, w)
+        _assert_close(vol[w].to_numpy(), exact, rtol=1e-8)
+        np.testing.assert_allclose(vol[w], pd.Series(r).rolling(w).std(), rtol=1e-5)
+
+    quiet = vol[100].iloc[500_099]
+    assert abs(quiet / 1e-6 - 1) < 0.5
+    assert (vol[5].iloc[700_004:700_050] == 0).all()
+
+
+def test_realized_volatility_leading_nan_and_gaps(monkeypatch):
+    # Small blocks so windows span several restarts of the sums
+    monkeypatch.setattr(sigma_r_framework, 'ROLLING_BLOCK_ROWS', 64)
+    close = _generate_synthetic_spy_data()['Close'].iloc[:1000]
+    returns = np.log(close).diff()
+    returns.iloc[[400, 401, 700]] = np.nan
+
+    windows = [2, 20, 63, 252]
+    vol = SigmaRCalculator().realized_volatility(returns, windows)
+    for w in windows:
+        expected = returns.rolling(w).std()
+        assert vol[w].isna().equals(expected.isna())
+        np.testing.assert_allclose(vol[w], expected, rtol=1e-9, atol=0)
+
+
+def test_compute_volatility_matches_rolling_std():
+    df = _generate_synthetic_spy_data()
+    calculator = SigmaRCalculator()
+    p = calculator.params
+    results = calculator.compute(df['Close'], df['Volume'])
+
+    returns = np.log(df['Close'] / df['Close'].shift(1)).fillna(0)
+    short = returns.rolling(p['short_vol_window']).std().fillna(0)
+    long = returns.rolling(p['long_vol_window']).std().fillna(0).clip(lower=p['epsilon'])
+    np.testing.assert_allclose(results['sigma_short'], short, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(results['sigma_long'], long, rtol=1e-9, atol=1e-15)
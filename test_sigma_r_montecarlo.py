@@ -0,0 +1,52 @@
+"""
+Tests for batched Σ_R evaluation and Monte Carlo bands (sigma_r_montecarlo.py).
+
+Run with: python -m pytest -q test_sigma_r_montecarlo.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigma_r_framework import SigmaRCalculator, _generate_synthetic_spy_data
+from sigma_r_montecarlo import sigma_r_confidence_bands
+
+
+@pytest.fixture(scope='module')
+def spy():
+    return _generate_synthetic_spy_data()
+
+
+@pytest.mark.parametrize('chunk_bytes', [64 * 2**20, 100_000, 1])
+def test_compute_batch_matches_compute(spy, chunk_bytes):
+    calculator = SigmaRCalculator()
+    expected = calculator.compute(spy['Close'], spy['Volume'])['sigma_R'].to_numpy()
+
+    returns = np.log(spy['Close'] / spy['Close'].shift(1)).fillna(0).to_numpy()
+    rng = np.random.default_rng(0)
+    paths = np.stack([returns, rng.permutation(returns)])
+    paths[:, 0] = 0.0
+    volumes = np.stack([spy['Volume'].to_numpy()] * 2)
+
+    batch = calculator.compute_batch(paths, volumes, chunk_bytes=chunk_bytes)
+    np.testing.assert_allclose(batch[0], expected, rtol=0, atol=1e-14)
+    # Rows are independent: the permuted path equals its own single-row batch
+    np.testing.assert_array_equal(
+        batch[1], calculator.compute_batch(paths[1:], volumes[1:], chunk_bytes=chunk_bytes)[0]
+    )
+
+
+@pytest.mark.parametrize('method', ['block', 'regime'])
+def test_bands_do_not_depend_on_blocking(spy, method):
+    prices, volumes = spy['Close'].iloc[:800], spy['Volume'].iloc[:800]
+    crises = {'Early': ('2007-06-01', '2007-09-30')}
+    runs = [
+        sigma_r_confidence_bands(prices, volumes, n_paths=12, method=method, crises=crises,
+                                 n_jobs=1, **blocking)
+        for blocking in ({'block_size': 12}, {'block_size': 5}, {'memory_budget': 2**19})
+    ]
+    for other in runs[1:]:
+        pd.testing.assert_frame_equal(runs[0]['bands'], other['bands'])
+        pd.testing.assert_frame_equal(runs[0]['crises'], other['crises'])
+    assert runs[0]['n_paths'] == 12
+    assert 0 < runs[0]['crises'].loc['Early', 'p_value'] <= 1
@@ -0,0 +1,68 @@
+"""
+Tests for the Python/JS parity harness (sigma_r_parity.py).
+
+Run with: python -m pytest -q test_sigma_r_parity.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigma_r_framework import SigmaRCalculator, _generate_synthetic_spy_data
+from sigma_r_parity import ParityReader, check_parity, export_reference
+
+
+@pytest.fixture(scope='module')
+def reference(tmp_path_factory):
+    df = _generate_synthetic_spy_data().iloc[:600]
+    path = str(tmp_path_factory.mktemp('parity') / 'ref.srpb')
+    export_reference(path, df['Close'], df['Volume'], SigmaRCalculator(), chunk_rows=128)
+    return path, ParityReader(path).to_frame()
+
+
+def _check(reference, frame, tmp_path, **to_csv):
+    path = str(tmp_path / 'candidate.csv')
+    frame.to_csv(path, **to_csv)
+    return check_parity(reference[0], path, block_rows=100)
+
+
+def test_complete_candidate_passes(reference, tmp_path):
+    frame = reference[1]
+    assert frame['volume'].notna().all()
+    report = _check(reference, frame, tmp_path)
+    assert report['ok'] and report['timestamps_checked']
+    assert report['candidate_rows'] == len(frame)
+
+
+def test_extra_or_missing_rows_fail(reference, tmp_path):
+    frame = reference[1]
+    report = _check(reference, pd.concat([frame, frame]), tmp_path)
+    assert not report['ok']
+    assert report['candidate_rows'] == 2 * len(frame)
+    assert report['first_divergence'] is None
+
+    report = _check(reference, frame.iloc[:-1], tmp_path)
+    assert not report['ok']
+    assert report['candidate_rows'] == len(frame) - 1
+
+
+def test_timestamp_mismatch_is_stage_zero(reference, tmp_path):
+    frame = reference[1].copy()
+    shifted = frame.index.to_numpy().copy()
+    shifted[345:] += np.timedelta64(1, 'D')
+    frame.index = pd.DatetimeIndex(shifted)
+    report = _check(reference, frame, tmp_path)
+    assert not report['ok']
+    first = report['first_divergence']
+    assert (first['row'], first['column'], first['stage']) == (345, 'timestamp', 0)
+
+
+def test_candidate_without_timestamps(reference, tmp_path):
+    frame = reference[1]
+    report = _check(reference, frame.reset_index(drop=True), tmp_path, index=False)
+    assert report['ok'] and not report['timestamps_checked']
+
+    stamped = frame.reset_index(drop=True)
+    stamped.insert(0, 'timestamp', frame.index.as_unit('ms').asi8)
+    report = _check(reference, stamped, tmp_path, index=False)
+    assert report['ok'] and report['timestamps_checked']
@@ -0,0 +1,64 @@
+"""
+Tests for the analytic Σ_R parameter Jacobian (SigmaRCalculator.compute_sensitivities).
+
+Run with: python -m pytest -q test_sigma_r_sensitivities.py
+"""
+
+import numpy as np
+import pytest
+
+from sigma_r_framework import SigmaRCalculator, _generate_synthetic_spy_data
+
+PARAMS = ['kappa', 'lambda', 'z', 'eta', 'mu', 'gamma_ent', 'gamma', 'rho']
+
+
+@pytest.fixture(scope='module')
+def spy():
+    return _generate_synthetic_spy_data().iloc[:700]
+
+
+def _calculator(**params):
+    params = dict(params)
+    if 'lambda' in params:
+        params['lambda_'] = params.pop('lambda')
+    return SigmaRCalculator(**params)
+
+
+def _central_difference(spy, params, name, rel_step=1e-6):
+    """∂Σ_R/∂θ by central differences, plus a mask of rows whose clip state is stable."""
+    h = rel_step * max(abs(params[name]), 1.0)
+    up = _calculator(**{**params, name: params[name] + h}).compute(spy['Close'], spy['Volume'])
+    down = _calculator(**{**params, name: params[name] - h}).compute(spy['Close'], spy['Volume'])
+    stable = np.ones(len(up), dtype=bool)
+    for column in ('sigma_C', 'sigma_R'):
+        for bound in (1e-12, 1.0):
+            stable &= (up[column] == bound).to_numpy() == (down[column] == bound).to_numpy()
+    return ((up['sigma_R'] - down['sigma_R']) / (2 * h)).to_numpy(), stable
+
+
+@pytest.mark.parametrize('overrides', [{}, {'mu': 30.0}], ids=['default', 'clipping'])
+def test_jacobian_matches_central_differences(spy, overrides):
+    calculator = _calculator(**overrides)
+    params = {k: calculator.params[k] for k in PARAMS}
+    df = calculator.compute(spy['Close'], spy['Volume'])
+    jac = calculator.compute_sensitivities(df)
+    assert list(jac.columns) == PARAMS
+
+    if overrides:
+        # Σ_C and Σ_R hit the 1e-12 floor on some rows; gradients there are 0
+        clipped = (df['sigma_R'] == 1e-12).to_numpy()
+        assert clipped.any() and (df['sigma_C'] == 1e-12).any()
+        assert (jac[clipped] == 0).all().all()
+
+    for name in PARAMS:
+        fd, stable = _central_difference(spy, params, name)
+        assert stable.mean() > 0.9
+        np.testing.assert_allclose(
+            jac[name].to_numpy()[stable], fd[stable], rtol=1e-6, atol=1e-9, err_msg=name
+        )
+
+
+def test_rejects_output_from_other_parameters(spy):
+    df = _calculator(kappa=3.0).compute(spy['Close'], spy['Volume'])
+    with pytest.raises(ValueError, match='parameters'):
+        _calculator().compute_sensitivities(df)